@@ -3,6 +3,41 @@
 import sys
 
 
+def _snapshot(argv: list[str]) -> None:
+    import argparse
+    from datetime import datetime, timedelta, timezone
+
+    from gcal_fast_mcp.config import get_config
+    from gcal_fast_mcp.snapshot import create_snapshot
+
+    now = datetime.now(timezone.utc)
+    parser = argparse.ArgumentParser(
+        prog="gcal_fast_mcp snapshot",
+        description="Write calendars to an offline snapshot archive.",
+    )
+    parser.add_argument(
+        "calendars", nargs="*", help="Calendar IDs to archive. Defaults to selected calendars."
+    )
+    parser.add_argument(
+        "--since",
+        default=(now - timedelta(days=3 * 365)).isoformat(),
+        help="Start of the archived range (ISO 8601). Defaults to three years ago.",
+    )
+    parser.add_argument(
+        "--until",
+        default=(now + timedelta(days=365)).isoformat(),
+        help="End of the archived range (ISO 8601). Defaults to one year ahead.",
+    )
+    parser.add_argument(
+        "--output", default=None, help="Archive path. Defaults to GCAL_SNAPSHOT_PATH."
+    )
+    args = parser.parse_args(argv)
+
+    output = args.output or get_config().snapshot_path
+    count = create_snapshot(output, args.calendars, args.since, args.until)
+    print(f"Snapshot of {count} events written to {output}.")
+
+
 def main() -> None:
     if len(sys.argv) > 1 and sys.argv[1] == "auth":
         from gcal_fast_mcp.auth import authenticate
@@ -11,8 +46,24 @@ def main() -> None:
         authenticate(redirect_uri)
         return
 
+    if len(sys.argv) > 1 and sys.argv[1] == "snapshot":
+        _snapshot(sys.argv[2:])
+        return
+
+    from gcal_fast_mcp.config import get_config
     from gcal_fast_mcp.server import mcp
 
+    if get_config().write_behind:
+        from gcal_fast_mcp.write_behind import get_write_queue
+
+        # Start flushing operations journaled before the last shutdown
+        get_write_queue()
+
+    if get_config().prefetch:
+        from gcal_fast_mcp.prefetch import get_prefetcher
+
+        get_prefetcher()
+
     mcp.run()
 
 
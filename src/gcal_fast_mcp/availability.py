@@ -0,0 +1,228 @@
+"""Local free/busy computation from events the server already holds.
+
+Complete event listings (unfiltered list_events results without a further
+page, and prefetched windows) are recorded per calendar for a short TTL. When
+the recorded windows cover an availability query for a calendar, its busy
+intervals are computed from those events instead of calling the freebusy
+endpoint. An event makes its calendar busy unless it is cancelled, marked
+transparent ("show as available"), or declined by the calendar's owner.
+All-day events (a ``date`` rather than ``dateTime``, as in ``_parse_event``)
+span whole days in the calendar's time zone.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone, tzinfo
+from datetime import time as dt_time
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from .reads import parse_instant
+
+# list_events' default windows end at 23:59:59, so treat a one-second gap
+# between recorded windows as contiguous
+_GAP_TOLERANCE = timedelta(seconds=1)
+
+
+def _zone(name: str) -> tzinfo:
+    if not name:
+        return timezone.utc
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        return timezone.utc
+
+
+def _format(value: datetime) -> str:
+    return value.astimezone(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def _declined_by_owner(raw: dict, calendar_id: str) -> bool:
+    """Whether the attendee who owns the calendar has declined the event."""
+    for attendee in raw.get("attendees", []):
+        owner = attendee.get("email") == calendar_id or (
+            calendar_id == "primary" and attendee.get("self", False)
+        )
+        if owner:
+            return attendee.get("responseStatus") == "declined"
+    return False
+
+
+def _event_interval(raw: dict, tz: tzinfo) -> tuple[datetime, datetime] | None:
+    start_info = raw.get("start", {})
+    end_info = raw.get("end", {})
+    all_day = "date" in start_info and "dateTime" not in start_info
+    if all_day:
+        start_day = date.fromisoformat(start_info["date"])
+        end_day = (
+            date.fromisoformat(end_info["date"])
+            if "date" in end_info
+            else start_day + timedelta(days=1)
+        )
+        return (
+            datetime.combine(start_day, dt_time(), tz),
+            datetime.combine(end_day, dt_time(), tz),
+        )
+    start = parse_instant(start_info.get("dateTime", ""))
+    end = parse_instant(end_info.get("dateTime", ""))
+    if start is None or end is None:
+        return None
+    return start, end
+
+
+def busy_intervals(
+    events: Iterable[dict],
+    calendar_id: str,
+    start: datetime,
+    end: datetime,
+    time_zone: str = "",
+) -> list[dict]:
+    """Merge the busy time of ``events`` within [start, end) into freebusy-style slots."""
+    tz = _zone(time_zone)
+    intervals = []
+    for raw in events:
+        if raw.get("status") == "cancelled" or raw.get("transparency") == "transparent":
+            continue
+        if _declined_by_owner(raw, calendar_id):
+            continue
+        interval = _event_interval(raw, tz)
+        if interval is None:
+            continue
+        lo, hi = max(interval[0], start), min(interval[1], end)
+        if lo < hi:
+            intervals.append((lo, hi))
+
+    merged: list[list[datetime]] = []
+    for lo, hi in sorted(intervals):
+        if merged and lo <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], hi)
+        else:
+            merged.append([lo, hi])
+    return [{"start": _format(lo), "end": _format(hi)} for lo, hi in merged]
+
+
+@dataclass
+class _Window:
+    start: datetime
+    end: datetime
+    items: list[dict]
+    time_zone: str
+    expires: float
+
+
+class LocalEventStore:
+    """Recently fetched, complete event listings per calendar and time window."""
+
+    def __init__(
+        self,
+        ttl: float = 120.0,
+        max_windows: int = 64,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._ttl = ttl
+        self._max_windows = max_windows
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._windows: OrderedDict[tuple[str, datetime, datetime], _Window] = OrderedDict()
+        # Bumped by invalidate() so listings that raced a write are not recorded
+        self._generations: dict[str, int] = {}
+
+    def generation(self, calendar_id: str) -> int:
+        """Current generation of a calendar; take it before fetching a listing to record."""
+        with self._lock:
+            return self._generations.get(calendar_id, 0)
+
+    def record(
+        self,
+        calendar_id: str,
+        time_min: str,
+        time_max: str,
+        items: list[dict],
+        time_zone: str = "",
+        ttl: float | None = None,
+        generation: int | None = None,
+    ) -> None:
+        """Remember every event of a calendar in [time_min, time_max].
+
+        If ``generation`` is given and the calendar has been invalidated since,
+        the listing may predate a write and is dropped.
+        """
+        start, end = parse_instant(time_min), parse_instant(time_max)
+        if start is None or end is None:
+            return
+        key = (calendar_id, start, end)
+        expires = self._clock() + (self._ttl if ttl is None else ttl)
+        with self._lock:
+            if generation is not None and self._generations.get(calendar_id, 0) != generation:
+                return
+            self._windows.pop(key, None)
+            self._windows[key] = _Window(start, end, list(items), time_zone, expires)
+            while len(self._windows) > self._max_windows:
+                self._windows.popitem(last=False)
+
+    def invalidate(self, calendar_id: str) -> None:
+        with self._lock:
+            self._generations[calendar_id] = self._generations.get(calendar_id, 0) + 1
+            for key in [k for k in self._windows if k[0] == calendar_id]:
+                del self._windows[key]
+
+    def busy(self, calendar_id: str, start: datetime, end: datetime) -> list[dict] | None:
+        """Busy slots for [start, end), or None if recorded windows don't cover it."""
+        now = self._clock()
+        with self._lock:
+            windows = sorted(
+                (
+                    w
+                    for (cal, _, _), w in self._windows.items()
+                    if cal == calendar_id and w.expires > now and w.end >= start and w.start <= end
+                ),
+                key=lambda w: w.start,
+            )
+
+        covered = start
+        for window in windows:
+            if window.start - covered > _GAP_TOLERANCE:
+                break
+            covered = max(covered, window.end)
+        if end - covered > _GAP_TOLERANCE or not windows:
+            return None
+
+        # Overlapping windows can hold the same event
+        events: dict[str, dict] = {}
+        for window in windows:
+            for raw in window.items:
+                events[raw.get("id", "")] = raw
+        return busy_intervals(events.values(), calendar_id, start, end, windows[0].time_zone)
+
+
+_store: LocalEventStore | None = None
+_store_lock = threading.Lock()
+
+
+def get_event_store() -> LocalEventStore:
+    """Return the process-wide store of locally held events."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            from .config import get_config
+
+            _store = LocalEventStore(ttl=get_config().local_availability_ttl)
+    return _store
+
+
+def local_busy(time_min: str, time_max: str, calendar_ids: Iterable[str]) -> dict[str, dict]:
+    """Freebusy-shaped results for the calendars whose events are held locally."""
+    start, end = parse_instant(time_min), parse_instant(time_max)
+    if start is None or end is None:
+        return {}
+    store = get_event_store()
+    result = {}
+    for calendar_id in calendar_ids:
+        busy = store.busy(calendar_id, start, end)
+        if busy is not None:
+            result[calendar_id] = {"busy": busy}
+    return result
@@ -1,56 +1,112 @@
-"""Lazy singleton for the authenticated Google Calendar API service."""
+"""Lazy singleton for the authenticated Google Calendar API service.
+
+The Google auth/client libraries and the settings are only loaded when the
+service is first requested, keeping server startup fast.
+"""
 
 from __future__ import annotations
 
 import json
+import threading
 from pathlib import Path
 
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
-
-from .config import Config
-
 SCOPES = [
     "https://www.googleapis.com/auth/calendar",
     "https://www.googleapis.com/auth/calendar.events",
 ]
 
-_config = Config()
-CONFIG_DIR = Path(_config.credentials_path).parent
-OAUTH_PATH = Path(_config.oauth_path)
-CREDENTIALS_PATH = Path(_config.credentials_path)
+_PATH_SETTINGS = {
+    "OAUTH_PATH": "oauth_path",
+    "CREDENTIALS_PATH": "credentials_path",
+}
+
+_local = threading.local()
+
+_credentials = None
+_credentials_lock = threading.Lock()
+
+
+def __getattr__(name: str) -> Path:
+    """Resolve CONFIG_DIR, OAUTH_PATH and CREDENTIALS_PATH from Config on first access."""
+    if name == "CONFIG_DIR":
+        return __getattr__("CREDENTIALS_PATH").parent
+    if name not in _PATH_SETTINGS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-_service = None
+    from .config import get_config
+
+    return Path(getattr(get_config(), _PATH_SETTINGS[name]))
 
 
 def get_calendar_service():
-    """Return a cached Calendar API service, creating it on first call."""
-    global _service
-    if _service is not None:
-        return _service
+    """Return this thread's cached Calendar API service, creating it on first call.
+
+    Tools run in a pool of worker threads; each keeps its own service because
+    the httplib2 transport underneath is not thread-safe.
+    """
+    service = getattr(_local, "service", None)
+    if service is None:
+        service = _local.service = build_calendar_service()
+    return service
+
+
+def build_calendar_service():
+    """Build a new Calendar API service.
+
+    The underlying httplib2 transport is not thread-safe, so background workers
+    should build their own service rather than share the cached one. The
+    credentials are shared, so only one thread loads and refreshes them.
+    """
+    from googleapiclient.discovery import build
+
+    return build("calendar", "v3", credentials=get_credentials())
 
-    if not CREDENTIALS_PATH.exists():
+
+def get_credentials():
+    """Return the process-wide OAuth credentials, loading or refreshing them if needed.
+
+    Serialized by a lock so that concurrent callers don't each read
+    credentials.json, refresh the token and rewrite the file.
+    """
+    global _credentials
+
+    from google.auth.transport.requests import Request
+
+    with _credentials_lock:
+        creds = _credentials
+        if creds is None:
+            creds = _credentials = _load_credentials()
+        if not creds.valid and creds.refresh_token:
+            from .config import get_config
+
+            creds.refresh(Request())
+            Path(get_config().credentials_path).write_text(creds.to_json())
+        return creds
+
+
+def _load_credentials():
+    """Read the saved token, filling in the client ID and secret from the OAuth keys."""
+    from google.oauth2.credentials import Credentials
+
+    from .config import get_config
+
+    config = get_config()
+    oauth_path = Path(config.oauth_path)
+    credentials_path = Path(config.credentials_path)
+
+    if not credentials_path.exists():
         raise RuntimeError(
-            f"No credentials found at {CREDENTIALS_PATH}. "
+            f"No credentials found at {credentials_path}. "
             "Run 'uv run python -m gcal_fast_mcp auth' first."
         )
 
-    token_data = json.loads(CREDENTIALS_PATH.read_text())
+    token_data = json.loads(credentials_path.read_text())
 
     # Merge client_id/client_secret from OAuth keys if missing in token
-    if "client_id" not in token_data and OAUTH_PATH.exists():
-        oauth_keys = json.loads(OAUTH_PATH.read_text())
+    if "client_id" not in token_data and oauth_path.exists():
+        oauth_keys = json.loads(oauth_path.read_text())
         client_info = oauth_keys.get("installed") or oauth_keys.get("web", {})
         token_data["client_id"] = client_info.get("client_id", "")
         token_data["client_secret"] = client_info.get("client_secret", "")
 
-    creds = Credentials.from_authorized_user_info(token_data, SCOPES)
-
-    if creds.expired and creds.refresh_token:
-        creds.refresh(Request())
-        CREDENTIALS_PATH.write_text(creds.to_json())
-
-    from googleapiclient.discovery import build
-
-    _service = build("calendar", "v3", credentials=creds)
-    return _service
+    return Credentials.from_authorized_user_info(token_data, SCOPES)
@@ -1,6 +1,8 @@
 """Application settings via pydantic-settings."""
 
+import functools
 import os
+from typing import Literal
 
 from pydantic import Field, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -25,9 +27,86 @@ class Config(BaseSettings):
         default=50,
         description="Default maximum number of events to return.",
     )
+    write_behind: bool = Field(
+        default=False,
+        description="Journal event mutations locally and apply them in the background.",
+    )
+    journal_path: str = Field(
+        default="~/.gcal-mcp/journal.sqlite3",
+        description="Path to the write-behind journal database.",
+    )
+    flush_interval: float = Field(
+        default=1.0,
+        description="Seconds between write-behind flushes.",
+    )
+    flush_max_attempts: int = Field(
+        default=8,
+        description="Attempts before a journaled operation is marked failed.",
+    )
+
+    prefetch: bool = Field(
+        default=False,
+        description="Keep rolling time windows of events warm in the background.",
+    )
+    prefetch_windows: list[str] = Field(
+        default=["today", "this_week", "next_week"],
+        description="Named UTC windows to prefetch: today, this_week, next_week.",
+    )
+    prefetch_calendars: list[str] = Field(
+        default_factory=list,
+        description="Calendars to prefetch in addition to the default calendar.",
+    )
+    prefetch_top_calendars: int = Field(
+        default=3,
+        description="Number of most frequently queried calendars to also prefetch.",
+    )
+    prefetch_min_interval: float = Field(
+        default=30.0,
+        description="Shortest refresh interval in seconds, used for the hottest windows.",
+    )
+    prefetch_max_interval: float = Field(
+        default=300.0,
+        description="Longest refresh interval in seconds; older data is never served.",
+    )
+
+    cursor_ttl: float = Field(
+        default=300.0,
+        description="Seconds a paging cursor stays valid.",
+    )
+    max_cursors: int = Field(
+        default=256,
+        description="Maximum number of paging cursors held at once.",
+    )
+
+    local_availability: bool = Field(
+        default=False,
+        description="Answer check_availability from recently fetched events when they cover "
+        "the window, instead of calling the freebusy endpoint.",
+    )
+    local_availability_ttl: float = Field(
+        default=120.0,
+        description="Seconds that fetched event listings may be used for availability checks.",
+    )
+    snapshot: Literal["off", "fallback", "always"] = Field(
+        default="off",
+        description="Serve read tools from the snapshot archive: never, when the API fails, "
+        "or always.",
+    )
+    snapshot_path: str = Field(
+        default="~/.gcal-mcp/snapshot.bin",
+        description="Path to the snapshot archive written by the 'snapshot' command.",
+    )
 
     @model_validator(mode="after")
     def _expand_paths(self) -> "Config":
         object.__setattr__(self, "oauth_path", os.path.expanduser(self.oauth_path))
         object.__setattr__(self, "credentials_path", os.path.expanduser(self.credentials_path))
+        object.__setattr__(self, "journal_path", os.path.expanduser(self.journal_path))
+        object.__setattr__(self, "snapshot_path", os.path.expanduser(self.snapshot_path))
         return self
+
+
+@functools.cache
+def get_config() -> Config:
+    """Return the process-wide Config, reading the environment on first call."""
+    return Config()
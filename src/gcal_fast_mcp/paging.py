@@ -0,0 +1,95 @@
+"""Opaque server-side cursors for paging tool results back to the client.
+
+A paged tool call stores whatever it needs to resume (upstream page tokens,
+items fetched but not yet returned) under a random cursor ID and hands the
+ID back as ``nextCursor``. Cursors are single-use, expire after a TTL, and
+the store holds a bounded number of them, evicting the oldest first. If
+fetching a page fails, its cursor stays valid so the client can retry it.
+"""
+
+from __future__ import annotations
+
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from typing import Any
+
+
+class CursorStore:
+    """Bounded, TTL-evicted map from opaque cursor IDs to resume state."""
+
+    def __init__(
+        self,
+        ttl: float = 300.0,
+        max_cursors: int = 256,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._ttl = ttl
+        self._max_cursors = max_cursors
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._cursors: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+
+    def put(self, state: Any, cursor: str | None = None) -> str:
+        """Store resume state under ``cursor``, or a new cursor ID, and return the ID."""
+        cursor = cursor or secrets.token_urlsafe(16)
+        with self._lock:
+            self._evict(self._clock())
+            while len(self._cursors) >= self._max_cursors:
+                self._cursors.popitem(last=False)
+            self._cursors[cursor] = (self._clock() + self._ttl, state)
+        return cursor
+
+    def take(self, cursor: str, kind: type) -> Any:
+        """Remove and return the state for a cursor, which must be of type ``kind``.
+
+        Raises ValueError if the cursor is unknown, expired or belongs to another tool.
+        """
+        with self._lock:
+            self._evict(self._clock())
+            entry = self._cursors.get(cursor)
+            if entry is None or not isinstance(entry[1], kind):
+                raise ValueError(f"Cursor {cursor!r} is unknown or has expired.")
+            del self._cursors[cursor]
+        return entry[1]
+
+    @contextmanager
+    def resume(self, cursor: str, kind: type) -> Iterator[Any]:
+        """Take a cursor's state for a block, putting it back if the block raises."""
+        state = self.take(cursor, kind)
+        try:
+            yield state
+        except Exception:
+            self.put(state, cursor)
+            raise
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._cursors)
+
+    def _evict(self, now: float) -> None:
+        # Cursors are stored in creation order with equal TTLs, so expiry is FIFO
+        while self._cursors:
+            expires, _ = next(iter(self._cursors.values()))
+            if expires > now:
+                break
+            self._cursors.popitem(last=False)
+
+
+_store: CursorStore | None = None
+_store_lock = threading.Lock()
+
+
+def get_cursor_store() -> CursorStore:
+    """Return the process-wide cursor store."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            from .config import get_config
+
+            config = get_config()
+            _store = CursorStore(ttl=config.cursor_ttl, max_cursors=config.max_cursors)
+    return _store
@@ -0,0 +1,281 @@
+"""Background prefetch of rolling time windows for list_events.
+
+The prefetcher keeps the events of a few named UTC windows ("today",
+"this_week", "next_week") warm for the configured calendars plus the
+calendars queried most often. Each window is refreshed on an adaptive
+schedule: the more often it has been asked for recently, the closer its
+refresh interval gets to ``min_interval``; idle windows relax towards
+``max_interval``. A list_events call whose range matches a warm window
+exactly is answered from memory.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import threading
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Any
+
+from .reads import fetch_events, parse_instant
+
+if TYPE_CHECKING:
+    from .availability import LocalEventStore
+
+logger = logging.getLogger(__name__)
+
+WINDOWS = ("today", "this_week", "next_week")
+
+# Observed query counts halve every hour
+_HALF_LIFE = 3600.0
+# Decayed query count a calendar needs to be prefetched as "frequently used",
+# e.g. three queries in the last few minutes or five spread over the last hour
+_MIN_CALENDAR_SCORE = 3.0
+# Scores below this are forgotten
+_FORGET_SCORE = 0.01
+_TICK = 5.0
+
+
+def window_bounds(name: str, now: datetime) -> tuple[datetime, datetime]:
+    """Return the inclusive UTC bounds of a named window, matching list_events' defaults."""
+    day = now.astimezone(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    if name == "today":
+        start, days = day, 1
+    elif name == "this_week":
+        start, days = day - timedelta(days=day.weekday()), 7
+    elif name == "next_week":
+        start, days = day - timedelta(days=day.weekday() - 7), 7
+    else:
+        raise ValueError(f"Unknown prefetch window: {name}")
+    return start, start + timedelta(days=days, seconds=-1)
+
+
+@dataclass
+class _Entry:
+    bounds: tuple[datetime, datetime]
+    items: list[dict]
+    fetched_at: float
+
+
+@dataclass
+class _Score:
+    value: float = 0.0
+    updated: float = 0.0
+
+    def decayed(self, now: float) -> float:
+        return self.value * math.pow(0.5, (now - self.updated) / _HALF_LIFE)
+
+    def bump(self, now: float) -> None:
+        self.value = self.decayed(now) + 1.0
+        self.updated = now
+
+
+class Prefetcher:
+    """Keeps rolling windows of events warm in memory for the hottest calendars."""
+
+    def __init__(
+        self,
+        service_factory: Callable[[], Any],
+        *,
+        windows: Iterable[str] = WINDOWS,
+        calendars: Iterable[str] = ("primary",),
+        top_calendars: int = 3,
+        min_interval: float = 30.0,
+        max_interval: float = 300.0,
+        clock: Callable[[], float] = time.time,
+        now: Callable[[], datetime] = lambda: datetime.now(timezone.utc),
+        store: LocalEventStore | None = None,
+    ) -> None:
+        self._windows = tuple(windows)
+        for name in self._windows:
+            window_bounds(name, datetime.now(timezone.utc))  # Reject unknown names early
+        self._calendars = tuple(dict.fromkeys(calendars))
+        self._top_calendars = top_calendars
+        self._min_interval = min_interval
+        self._max_interval = max_interval
+        self._clock = clock
+        self._now = now
+        self._store = store
+
+        self._lock = threading.Lock()
+        self._entries: dict[tuple[str, str], _Entry] = {}
+        self._window_scores: dict[tuple[str, str], _Score] = {}
+        self._calendar_scores: dict[str, _Score] = {}
+        # Bumped by invalidate() so fetches that raced a mutation are discarded
+        self._generations: dict[str, int] = {}
+
+        self._service_factory = service_factory
+        self._service = None
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    # -- Serving -------------------------------------------------------------
+
+    def lookup(self, calendar_id: str, time_min: str, time_max: str) -> list[dict] | None:
+        """Record a list_events query and return warm items if its range is a known window."""
+        ts = self._clock()
+        match = self._match_window(time_min, time_max)
+        with self._lock:
+            self._calendar_scores.setdefault(calendar_id, _Score()).bump(ts)
+            if match is None:
+                return None
+            name, bounds = match
+            self._window_scores.setdefault((calendar_id, name), _Score()).bump(ts)
+            entry = self._entries.get((calendar_id, name))
+            if (
+                entry is None
+                or entry.bounds != bounds
+                or ts - entry.fetched_at > self._max_interval
+            ):
+                return None
+            return entry.items
+
+    def invalidate(self, calendar_id: str) -> None:
+        """Drop warm windows for a calendar after a mutation and refresh them soon."""
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == calendar_id]:
+                del self._entries[key]
+            self._generations[calendar_id] = self._generations.get(calendar_id, 0) + 1
+        self._wake.set()
+
+    def _match_window(
+        self, time_min: str, time_max: str
+    ) -> tuple[str, tuple[datetime, datetime]] | None:
+        start, end = parse_instant(time_min), parse_instant(time_max)
+        if start is None or end is None:
+            return None
+        now = self._now()
+        for name in self._windows:
+            bounds = window_bounds(name, now)
+            if bounds == (start, end):
+                return name, bounds
+        return None
+
+    # -- Scheduling ----------------------------------------------------------
+
+    def interval(self, calendar_id: str, name: str) -> float:
+        """Refresh interval for a window, shrinking as it is queried more often."""
+        score = self._window_scores.get((calendar_id, name), _Score()).decayed(self._clock())
+        return max(self._min_interval, self._max_interval / (1.0 + score))
+
+    def targets(self) -> list[tuple[str, str]]:
+        """Calendar/window pairs to keep warm: configured calendars plus the hottest ones."""
+        ts = self._clock()
+        scores = {cal: score.decayed(ts) for cal, score in self._calendar_scores.items()}
+        for cal in [cal for cal, value in scores.items() if value < _FORGET_SCORE]:
+            del self._calendar_scores[cal]
+        ranked = sorted(
+            (cal for cal, value in scores.items() if value >= _MIN_CALENDAR_SCORE),
+            key=scores.__getitem__,
+            reverse=True,
+        )
+        calendars = dict.fromkeys([*self._calendars, *ranked[: self._top_calendars]])
+        return [(cal, name) for cal in calendars for name in self._windows]
+
+    def refresh_due(self) -> int:
+        """Fetch every target window that is missing, rolled over or past its interval."""
+        ts = self._clock()
+        now = self._now()
+        with self._lock:
+            targets = self.targets()
+            # Forget windows of calendars that have fallen out of the target set
+            for key in set(self._entries) - set(targets):
+                del self._entries[key]
+
+            due = []
+            for cal, name in targets:
+                bounds = window_bounds(name, now)
+                entry = self._entries.get((cal, name))
+                if (
+                    entry is None
+                    or entry.bounds != bounds
+                    or ts - entry.fetched_at >= self.interval(cal, name)
+                ):
+                    due.append((cal, name, bounds, self._generations.get(cal, 0)))
+
+        refreshed = 0
+        for cal, name, bounds, generation in due:
+            try:
+                items, time_zone = self._fetch(cal, bounds)
+            except Exception:
+                logger.exception("Prefetch of %s/%s failed", cal, name)
+                continue
+            with self._lock:
+                if self._generations.get(cal, 0) != generation:
+                    continue
+                self._entries[(cal, name)] = _Entry(bounds, items, self._clock())
+                if self._store is not None:
+                    self._store.record(
+                        cal,
+                        bounds[0].isoformat(),
+                        bounds[1].isoformat(),
+                        items,
+                        time_zone,
+                        ttl=self._max_interval,
+                    )
+            refreshed += 1
+        return refreshed
+
+    def _fetch(self, calendar_id: str, bounds: tuple[datetime, datetime]) -> tuple[list[dict], str]:
+        """Fetch all events in a window, returning them with the calendar's time zone."""
+        if self._service is None:
+            self._service = self._service_factory()
+        return fetch_events(
+            self._service, calendar_id, bounds[0].isoformat(), bounds[1].isoformat()
+        )
+
+    # -- Background thread ---------------------------------------------------
+
+    def start(self) -> None:
+        """Start the background refresher if it is not already running."""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="gcal-prefetch", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float | None = None) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.refresh_due()
+            except Exception:
+                logger.exception("Prefetch refresh failed")
+            self._wake.wait(_TICK)
+            self._wake.clear()
+
+
+_prefetcher: Prefetcher | None = None
+_prefetcher_lock = threading.Lock()
+
+
+def get_prefetcher() -> Prefetcher:
+    """Return the process-wide prefetcher, starting its refresher on first call."""
+    global _prefetcher
+    with _prefetcher_lock:
+        if _prefetcher is None:
+            from .availability import get_event_store
+            from .calendar_service import build_calendar_service
+            from .config import get_config
+
+            config = get_config()
+            _prefetcher = Prefetcher(
+                build_calendar_service,
+                windows=config.prefetch_windows,
+                calendars=[config.default_calendar, *config.prefetch_calendars],
+                top_calendars=config.prefetch_top_calendars,
+                min_interval=config.prefetch_min_interval,
+                max_interval=config.prefetch_max_interval,
+                store=get_event_store() if config.local_availability else None,
+            )
+            _prefetcher.start()
+    return _prefetcher
@@ -0,0 +1,149 @@
+"""Plumbing shared by the read tools.
+
+Routes reads between the live API and the offline snapshot, invalidates
+cached reads after a write, and holds the event-window fetch and timestamp
+parsing used by the snapshot, prefetch and local availability modules.
+Those optional features are all off by default, so their modules are only
+imported once their setting is on.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from collections.abc import Callable
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, TypeVar
+
+if TYPE_CHECKING:
+    from .snapshot import SnapshotArchive
+
+T = TypeVar("T")
+
+_archive: SnapshotArchive | None = None
+_archive_key: tuple[str, int, int] | None = None
+_archive_lock = threading.Lock()
+
+# Largest page events.list serves, for fetches that want a whole window
+_PAGE_SIZE = 2500
+
+
+def parse_instant(value: str) -> datetime | None:
+    """Parse an ISO 8601 timestamp, or return None unless it is a valid offset-aware instant."""
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo is not None else None
+
+
+def fetch_events(
+    service: Any, calendar_id: str, time_min: str, time_max: str
+) -> tuple[list[dict], str]:
+    """Fetch every expanded event of a calendar in a time range, following page tokens.
+
+    Returns the events with the calendar's time zone as reported by the API.
+    """
+    items: list[dict] = []
+    page_token = None
+    while True:
+        kwargs: dict = {
+            "calendarId": calendar_id,
+            "timeMin": time_min,
+            "timeMax": time_max,
+            "maxResults": _PAGE_SIZE,
+            "singleEvents": True,
+            "orderBy": "startTime",
+        }
+        if page_token:
+            kwargs["pageToken"] = page_token
+        result = service.events().list(**kwargs).execute()
+        items.extend(result.get("items", []))
+        page_token = result.get("nextPageToken")
+        if not page_token:
+            return items, result.get("timeZone", "")
+
+
+def _api_unavailable(exc: BaseException) -> bool:
+    """Whether a live call failed because the API could not be reached or answer.
+
+    Caller errors (bad arguments, 4xx responses) are not, and are not masked
+    by the snapshot.
+    """
+    status = getattr(getattr(exc, "resp", None), "status", None)
+    if status is not None:
+        return int(status) >= 500 or int(status) == 429
+    if isinstance(exc, OSError):
+        return True
+
+    import httplib2
+    from google.auth.exceptions import TransportError
+
+    return isinstance(exc, (httplib2.HttpLib2Error, TransportError))
+
+
+def get_archive() -> SnapshotArchive:
+    """Return the configured archive, reopening it if the file has been replaced."""
+    global _archive, _archive_key
+    from .config import get_config
+
+    path = get_config().snapshot_path
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        raise RuntimeError(
+            f"No snapshot found at {path}. Run 'uv run python -m gcal_fast_mcp snapshot' first."
+        ) from None
+
+    with _archive_lock:
+        key = (path, st.st_ino, st.st_mtime_ns)
+        if _archive is None or _archive_key != key:
+            from .snapshot import SnapshotArchive
+
+            _archive = SnapshotArchive(path)
+            _archive_key = key
+        return _archive
+
+
+def serve_read(live: Callable[[], T], offline: Callable[[SnapshotArchive], T]) -> T:
+    """Run a read against the API or the snapshot archive, according to Config.snapshot."""
+    from .config import get_config
+
+    mode = get_config().snapshot
+    if mode == "always":
+        return offline(get_archive())
+    if mode == "off":
+        return live()
+    try:
+        return live()
+    except Exception as exc:
+        if not _api_unavailable(exc):
+            raise
+        # Surface the original API error if the snapshot cannot answer either
+        try:
+            return offline(get_archive())
+        except Exception:
+            raise exc from None
+
+
+def invalidate_cached(calendar_id: str) -> None:
+    """Drop prefetched windows and locally held events of a calendar once a write is applied.
+
+    In write-behind mode this runs from the flusher after the API has accepted
+    the mutation; invalidating at enqueue time would let the refresher refetch
+    and cache the pre-write events.
+    """
+    from .config import get_config
+    from .singleflight import note_write
+
+    # Reads starting from here must not join calls that began before the write
+    note_write(calendar_id)
+    config = get_config()
+    if config.prefetch:
+        from .prefetch import get_prefetcher
+
+        get_prefetcher().invalidate(calendar_id)
+    if config.local_availability:
+        from .availability import get_event_store
+
+        get_event_store().invalidate(calendar_id)
@@ -1,9 +1,31 @@
 """Google Calendar MCP Server — FastMCP v2 implementation."""
 
+from __future__ import annotations
+
+import functools
+from collections.abc import Awaitable, Callable
+
+import anyio.to_thread
 from fastmcp import FastMCP
 
 mcp = FastMCP("Google Calendar")
 
+
+def in_thread[**P, R](fn: Callable[P, R]) -> Callable[P, Awaitable[R]]:
+    """Run a blocking tool function in a worker thread.
+
+    FastMCP calls sync tools inline on the event loop, so without this one slow
+    API call holds up every other request and concurrent identical reads never
+    overlap long enough to be coalesced.
+    """
+
+    @functools.wraps(fn)
+    async def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+        return await anyio.to_thread.run_sync(functools.partial(fn, *args, **kwargs))
+
+    return wrapper
+
+
 # Importing tool modules triggers @mcp.tool() registration
 from gcal_fast_mcp.tools import (  # noqa: E402, F401
     calendar_ops,
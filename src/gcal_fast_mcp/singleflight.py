@@ -0,0 +1,90 @@
+"""In-flight request coalescing for concurrent identical reads.
+
+Read keys include the calendar's write generation, which is bumped whenever a
+write to that calendar is applied. A read that starts after a write returned
+therefore never joins a call that began before it.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Callable, Hashable
+from typing import Any
+
+
+class _Call:
+    """A single upstream call that one or more callers are waiting on."""
+
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    """Share one execution of a function among concurrent callers with the same key.
+
+    The first caller for a key runs the function; callers arriving while it is
+    still running block and receive the same result (or exception). Once the
+    call finishes the key is forgotten, so later callers trigger a fresh call.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, _Call] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def in_flight(self) -> int:
+        """Return the number of keys with a call currently running."""
+        with self._lock:
+            return len(self._calls)
+
+
+_group = SingleFlight()
+
+
+def coalesce(key: Hashable, fn: Callable[[], Any]) -> Any:
+    """Run ``fn`` once for all concurrent callers passing an equal ``key``."""
+    return _group.do(key, fn)
+
+
+_generations: dict[str, int] = {}
+_generations_lock = threading.Lock()
+
+
+def note_write(calendar_id: str) -> None:
+    """Record that a write to ``calendar_id`` has been applied."""
+    with _generations_lock:
+        _generations[calendar_id] = _generations.get(calendar_id, 0) + 1
+
+
+def write_generation(calendar_id: str) -> int:
+    """Return the number of writes applied to ``calendar_id``, for use in read keys."""
+    with _generations_lock:
+        return _generations.get(calendar_id, 0)
@@ -0,0 +1,363 @@
+"""Offline snapshot archive of calendars and events.
+
+``python -m gcal_fast_mcp snapshot`` writes selected calendars to a compact
+binary file. The read tools can then serve from it, either always (offline
+analytics) or only when the API is unreachable or unavailable, depending on
+``Config.snapshot``. The archive is memory-mapped, so only the pages a query
+touches are read in.
+
+Layout (little-endian, offsets absolute)::
+
+    header    magic, version, calendar count, event count, table offsets
+    data      JSON blobs: one per calendar list entry and one per event
+    calendars per calendar: metadata blob, first record, record count,
+              longest event duration
+    records   per event: start, end (epoch seconds), blob offset and length;
+              grouped by calendar, sorted by start within each calendar
+    ids       per event: 64-bit hash of (calendar ID, event ID) and record
+              index, sorted by hash
+
+Time-range lookups binary-search a calendar's records by start time, beginning
+one longest-duration earlier so events already in progress are included.
+All-day events are indexed from midnight UTC.
+"""
+
+from __future__ import annotations
+
+import bisect
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+from collections.abc import Iterable
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+
+from .availability import busy_intervals
+from .reads import fetch_events
+
+_MAGIC = b"GCALSNAP"
+_VERSION = 1
+_HEADER = struct.Struct("<8sIIIQQQ")
+_CALENDAR = struct.Struct("<QIIIq")
+_RECORD = struct.Struct("<qqQI")
+_ID = struct.Struct("<QI")
+
+
+def _to_timestamp(value: str) -> int:
+    """Convert an ISO 8601 date or datetime to epoch seconds, treating naive values as UTC."""
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return int(parsed.timestamp())
+
+
+def _event_bounds(raw: dict) -> tuple[int, int] | None:
+    start = raw.get("start", {})
+    end = raw.get("end", {})
+    start_value = start.get("dateTime") or start.get("date")
+    end_value = end.get("dateTime") or end.get("date") or start_value
+    if not start_value:
+        return None
+    return _to_timestamp(start_value), _to_timestamp(end_value)
+
+
+def _id_hash(calendar_id: str, event_id: str) -> int:
+    digest = hashlib.blake2b(f"{calendar_id}\0{event_id}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+# ---------------------------------------------------------------------------
+# Writing
+# ---------------------------------------------------------------------------
+
+
+def write_snapshot(path: str | Path, calendars: Iterable[tuple[dict, list[dict]]]) -> int:
+    """Write calendar list entries and their raw events to an archive. Returns the event count.
+
+    The file is written next to ``path`` and renamed into place, so readers
+    holding the previous archive open are not disturbed.
+    """
+    path = Path(path)
+    data = bytearray()
+    calendar_rows: list[tuple[int, int, int, int, int]] = []
+    records: list[tuple[int, int, int, int]] = []
+    ids: list[tuple[int, int]] = []
+
+    def blob(obj: Any) -> tuple[int, int]:
+        encoded = json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode()
+        offset = _HEADER.size + len(data)
+        data.extend(encoded)
+        return offset, len(encoded)
+
+    for info, events in calendars:
+        calendar_id = info["id"]
+        timed = []
+        for raw in events:
+            bounds = _event_bounds(raw)
+            if bounds is not None:
+                timed.append((bounds, raw))
+        timed.sort(key=lambda item: item[0])
+
+        meta_off, meta_len = blob(info)
+        first = len(records)
+        max_duration = 0
+        for (start, end), raw in timed:
+            offset, length = blob(raw)
+            ids.append((_id_hash(calendar_id, raw.get("id", "")), len(records)))
+            records.append((start, end, offset, length))
+            max_duration = max(max_duration, end - start)
+        calendar_rows.append((meta_off, meta_len, first, len(timed), max_duration))
+
+    ids.sort()
+    calendars_off = _HEADER.size + len(data)
+    records_off = calendars_off + _CALENDAR.size * len(calendar_rows)
+    ids_off = records_off + _RECORD.size * len(records)
+
+    tmp = path.with_name(path.name + ".tmp")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(tmp, "wb") as f:
+        f.write(
+            _HEADER.pack(
+                _MAGIC,
+                _VERSION,
+                len(calendar_rows),
+                len(records),
+                calendars_off,
+                records_off,
+                ids_off,
+            )
+        )
+        f.write(data)
+        for row in calendar_rows:
+            f.write(_CALENDAR.pack(*row))
+        for rec in records:
+            f.write(_RECORD.pack(*rec))
+        for entry in ids:
+            f.write(_ID.pack(*entry))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    return len(records)
+
+
+def create_snapshot(
+    path: str | Path,
+    calendar_ids: list[str] | None,
+    time_min: str,
+    time_max: str,
+) -> int:
+    """Fetch calendars from the API and write them to an archive at ``path``.
+
+    With no calendar IDs, every calendar marked as selected in the user's
+    calendar list is archived.
+    """
+    from .calendar_service import get_calendar_service
+
+    service = get_calendar_service()
+    entries = service.calendarList().list().execute().get("items", [])
+    if calendar_ids:
+        by_id = {entry.get("id"): entry for entry in entries}
+        for entry in entries:
+            if entry.get("primary"):
+                by_id.setdefault("primary", entry)
+        entries = [by_id.get(cal_id, {"id": cal_id}) for cal_id in calendar_ids]
+    else:
+        entries = [entry for entry in entries if entry.get("selected")]
+
+    calendars = []
+    for entry in entries:
+        events, time_zone = fetch_events(service, entry["id"], time_min, time_max)
+        if time_zone and not entry.get("timeZone"):
+            entry = {**entry, "timeZone": time_zone}
+        print(f"{entry['id']}: {len(events)} events", file=sys.stderr)
+        calendars.append((entry, events))
+    return write_snapshot(path, calendars)
+
+
+# ---------------------------------------------------------------------------
+# Reading
+# ---------------------------------------------------------------------------
+
+
+class _Starts:
+    """Sequence view of record start times for bisect."""
+
+    def __init__(self, archive: SnapshotArchive) -> None:
+        self._archive = archive
+
+    def __len__(self) -> int:
+        return self._archive.event_count
+
+    def __getitem__(self, index: int) -> int:
+        return self._archive._record(index)[0]
+
+
+class _Hashes:
+    """Sequence view of the sorted ID hashes for bisect."""
+
+    def __init__(self, archive: SnapshotArchive) -> None:
+        self._archive = archive
+
+    def __len__(self) -> int:
+        return self._archive.event_count
+
+    def __getitem__(self, index: int) -> int:
+        return self._archive._id_entry(index)[0]
+
+
+class SnapshotArchive:
+    """Read-only, memory-mapped view of a snapshot archive."""
+
+    def __init__(self, path: str | Path) -> None:
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        (
+            magic,
+            version,
+            self.calendar_count,
+            self.event_count,
+            self._calendars_off,
+            self._records_off,
+            self._ids_off,
+        ) = _HEADER.unpack_from(self._mm, 0)
+        if magic != _MAGIC or version != _VERSION:
+            self._mm.close()
+            raise ValueError(f"{path} is not a version {_VERSION} snapshot archive.")
+
+        self._sections: dict[str, tuple[int, int, int, int]] = {}
+        # Tools default to the "primary" alias, but calendars are archived
+        # under their real IDs; resolve it to the entry marked primary
+        self._primary = "primary"
+        for i in range(self.calendar_count):
+            meta_off, meta_len, first, count, max_duration = _CALENDAR.unpack_from(
+                self._mm, self._calendars_off + i * _CALENDAR.size
+            )
+            info = self._load(meta_off, meta_len)
+            self._sections[info["id"]] = (i, first, count, max_duration)
+            if info.get("primary"):
+                self._primary = info["id"]
+
+    def close(self) -> None:
+        self._mm.close()
+
+    # -- Low-level access ----------------------------------------------------
+
+    def _load(self, offset: int, length: int) -> Any:
+        return json.loads(self._mm[offset : offset + length])
+
+    def _record(self, index: int) -> tuple[int, int, int, int]:
+        return _RECORD.unpack_from(self._mm, self._records_off + index * _RECORD.size)
+
+    def _id_entry(self, index: int) -> tuple[int, int]:
+        return _ID.unpack_from(self._mm, self._ids_off + index * _ID.size)
+
+    def _event(self, index: int) -> dict:
+        _, _, offset, length = self._record(index)
+        return self._load(offset, length)
+
+    def _calendar_meta(self, position: int) -> dict:
+        meta_off, meta_len, *_ = _CALENDAR.unpack_from(
+            self._mm, self._calendars_off + position * _CALENDAR.size
+        )
+        return self._load(meta_off, meta_len)
+
+    # -- Queries -------------------------------------------------------------
+
+    def _resolve(self, calendar_id: str) -> str:
+        return self._primary if calendar_id == "primary" else calendar_id
+
+    def _section(self, calendar_id: str) -> tuple[int, int, int, int]:
+        section = self._sections.get(self._resolve(calendar_id))
+        if section is None:
+            raise LookupError(f"Calendar {calendar_id} is not in the snapshot.")
+        return section
+
+    def has_calendar(self, calendar_id: str) -> bool:
+        return self._resolve(calendar_id) in self._sections
+
+    def calendars(self) -> list[dict]:
+        """Return the archived calendar list entries."""
+        return [self._calendar_meta(i) for i in range(self.calendar_count)]
+
+    def calendar(self, calendar_id: str) -> dict:
+        return self._calendar_meta(self._section(calendar_id)[0])
+
+    def events(
+        self,
+        calendar_id: str,
+        time_min: str,
+        time_max: str,
+        query: str = "",
+        order_by: str = "startTime",
+    ) -> list[dict]:
+        """Return raw events of a calendar overlapping [time_min, time_max)."""
+        _, first, count, max_duration = self._section(calendar_id)
+        lo_ts, hi_ts = _to_timestamp(time_min), _to_timestamp(time_max)
+
+        starts = _Starts(self)
+        lo = bisect.bisect_left(starts, lo_ts - max_duration, first, first + count)
+        hi = bisect.bisect_left(starts, hi_ts, lo, first + count)
+
+        needle = query.casefold()
+        events = []
+        for index in range(lo, hi):
+            start, end, offset, length = self._record(index)
+            if end <= lo_ts and start < lo_ts:
+                continue
+            raw = self._load(offset, length)
+            if needle and not any(
+                needle in str(raw.get(key, "")).casefold()
+                for key in ("summary", "description", "location")
+            ):
+                continue
+            events.append(raw)
+
+        if order_by == "updated":
+            events.sort(key=lambda raw: raw.get("updated", ""))
+        return events
+
+    def get_event(self, calendar_id: str, event_id: str) -> dict:
+        resolved = self._resolve(calendar_id)
+        target = _id_hash(resolved, event_id)
+        hashes = _Hashes(self)
+        i = bisect.bisect_left(hashes, target)
+        while i < self.event_count:
+            hashed, index = self._id_entry(i)
+            if hashed != target:
+                break
+            raw = self._event(index)
+            if raw.get("id") == event_id and self._calendar_of(index) == resolved:
+                return raw
+            i += 1
+        raise LookupError(f"Event {event_id} is not in the snapshot of {calendar_id}.")
+
+    def busy(self, time_min: str, time_max: str, calendar_ids: Iterable[str]) -> dict:
+        """Busy intervals per calendar, shaped like a freebusy query's ``calendars``.
+
+        Raises LookupError if a calendar is not archived, rather than reporting
+        it as free.
+        """
+        start = datetime.fromtimestamp(_to_timestamp(time_min), timezone.utc)
+        end = datetime.fromtimestamp(_to_timestamp(time_max), timezone.utc)
+        # All-day events are indexed in UTC but end in the calendar's zone, so
+        # scan a day either side and let busy_intervals clip to the window
+        scan_min = (start - timedelta(days=1)).isoformat()
+        scan_max = (end + timedelta(days=1)).isoformat()
+
+        result: dict[str, dict] = {}
+        for calendar_id in calendar_ids:
+            events = self.events(calendar_id, scan_min, scan_max)
+            time_zone = self.calendar(calendar_id).get("timeZone", "")
+            owner = self._resolve(calendar_id)
+            result[calendar_id] = {"busy": busy_intervals(events, owner, start, end, time_zone)}
+        return result
+
+    def _calendar_of(self, index: int) -> str | None:
+        for calendar_id, (_, first, count, _) in self._sections.items():
+            if first <= index < first + count:
+                return calendar_id
+        return None
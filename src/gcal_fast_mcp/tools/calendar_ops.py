@@ -6,7 +6,8 @@ import json
 from typing import Annotated
 
 from gcal_fast_mcp.calendar_service import get_calendar_service
-from gcal_fast_mcp.server import mcp
+from gcal_fast_mcp.reads import serve_read
+from gcal_fast_mcp.server import in_thread, mcp
 from gcal_fast_mcp.types import CalendarInfo
 
 _READ_ONLY = {
@@ -18,11 +19,13 @@ _READ_ONLY = {
 
 
 @mcp.tool(annotations=_READ_ONLY)
+@in_thread
 def list_calendars() -> str:
     """List all calendars the user has access to. Returns JSON array."""
-    service = get_calendar_service()
-    result = service.calendarList().list().execute()
-    items = result.get("items", [])
+    items = serve_read(
+        lambda: get_calendar_service().calendarList().list().execute().get("items", []),
+        lambda archive: archive.calendars(),
+    )
 
     calendars = [
         CalendarInfo(
@@ -42,12 +45,15 @@ def list_calendars() -> str:
 
 
 @mcp.tool(annotations=_READ_ONLY)
+@in_thread
 def get_calendar(
     calendar_id: Annotated[str, "Calendar ID to retrieve."] = "primary",
 ) -> str:
     """Get details of a specific calendar."""
-    service = get_calendar_service()
-    cal = service.calendarList().get(calendarId=calendar_id).execute()
+    cal = serve_read(
+        lambda: get_calendar_service().calendarList().get(calendarId=calendar_id).execute(),
+        lambda archive: archive.calendar(calendar_id),
+    )
 
     info = CalendarInfo(
         id=cal.get("id", ""),
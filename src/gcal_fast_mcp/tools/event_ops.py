@@ -1,15 +1,26 @@
-"""Event operations: list, get, create, update, delete, quick_add."""
+"""Event operations: list, get, create, update, delete, quick_add, operation status."""
 
 from __future__ import annotations
 
 import json
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import Annotated
+from typing import TYPE_CHECKING, Annotated
 
 from gcal_fast_mcp.calendar_service import get_calendar_service
-from gcal_fast_mcp.server import mcp
+from gcal_fast_mcp.config import get_config
+from gcal_fast_mcp.paging import get_cursor_store
+from gcal_fast_mcp.reads import invalidate_cached, serve_read
+from gcal_fast_mcp.server import in_thread, mcp
+from gcal_fast_mcp.singleflight import coalesce, write_generation
 from gcal_fast_mcp.types import Attendee, Event
 
+if TYPE_CHECKING:
+    from gcal_fast_mcp.snapshot import SnapshotArchive
+
+# Write-behind, prefetch and local availability are off by default, so their
+# modules are imported only in the branches that use them
+
 _READ_ONLY = {
     "readOnlyHint": True,
     "destructiveHint": False,
@@ -31,6 +42,10 @@ _DELETE = {
     "openWorldHint": False,
 }
 
+# Upstream page size for paged list_events calls with a small page_size
+_UPSTREAM_PAGE_SIZE = 250
+_API_MAX_RESULTS = 2500
+
 
 # ---------------------------------------------------------------------------
 # Helpers
@@ -76,12 +91,96 @@ def _parse_event(raw: dict, calendar_id: str = "") -> Event:
     )
 
 
+def _update_fields(
+    summary: str | None,
+    start: str | None,
+    end: str | None,
+    description: str | None,
+    location: str | None,
+    attendees: list[str] | None,
+) -> dict:
+    """Build the API body fields for an update, skipping arguments left as None."""
+    fields: dict = {}
+    if summary is not None:
+        fields["summary"] = summary
+    if start is not None:
+        fields["start"] = {"dateTime": start}
+    if end is not None:
+        fields["end"] = {"dateTime": end}
+    if description is not None:
+        fields["description"] = description
+    if location is not None:
+        fields["location"] = location
+    if attendees is not None:
+        fields["attendees"] = [{"email": email} for email in attendees]
+    return fields
+
+
+def _enqueue(
+    operation: str, calendar_id: str, event_id: str = "", payload: dict | None = None
+) -> str:
+    """Journal a mutation for the write-behind flusher and return the pending operation."""
+    from gcal_fast_mcp.write_behind import get_write_queue
+
+    # Cached events are invalidated by the flusher once the write is applied
+    pending = get_write_queue().enqueue(operation, calendar_id, event_id, payload)
+    return json.dumps(pending.model_dump(), ensure_ascii=False)
+
+
+@dataclass
+class _EventPage:
+    """Resume state for a paged list_events call, held server-side behind a cursor."""
+
+    calendar_id: str
+    request: dict
+    page_size: int
+    remaining: int
+    buffer: list[dict] = field(default_factory=list)
+    page_token: str = ""
+    exhausted: bool = False
+
+
+def _next_event_page(state: _EventPage) -> str:
+    """Return the next page of events as JSON, fetching upstream only as needed."""
+    while len(state.buffer) < state.page_size and not state.exhausted:
+        kwargs = {
+            **state.request,
+            "maxResults": min(
+                state.remaining, max(state.page_size, _UPSTREAM_PAGE_SIZE), _API_MAX_RESULTS
+            ),
+        }
+        if state.page_token:
+            kwargs["pageToken"] = state.page_token
+        service = get_calendar_service()
+        result = coalesce(
+            ("events.list", write_generation(state.calendar_id), tuple(sorted(kwargs.items()))),
+            lambda: service.events().list(**kwargs).execute(),
+        )
+        items = result.get("items", [])[: state.remaining]
+        state.buffer.extend(items)
+        state.remaining -= len(items)
+        state.page_token = result.get("nextPageToken", "")
+        state.exhausted = not state.page_token or state.remaining <= 0
+
+    page, state.buffer = state.buffer[: state.page_size], state.buffer[state.page_size :]
+    next_cursor = None
+    if state.buffer or not state.exhausted:
+        next_cursor = get_cursor_store().put(state)
+
+    events = [_parse_event(e, state.calendar_id) for e in page]
+    return json.dumps(
+        {"events": [e.model_dump(by_alias=True) for e in events], "nextCursor": next_cursor},
+        ensure_ascii=False,
+    )
+
+
 # ---------------------------------------------------------------------------
 # Tools
 # ---------------------------------------------------------------------------
 
 
 @mcp.tool(annotations=_READ_ONLY)
+@in_thread
 def list_events(
     calendar_id: Annotated[str, "Calendar ID to query. Defaults to primary."] = "primary",
     time_min: Annotated[
@@ -95,15 +194,29 @@ def list_events(
         str,
         "Sort order: 'startTime' (requires singleEvents=true) or 'updated'.",
     ] = "startTime",
+    page_size: Annotated[
+        int,
+        "If set, return {events, nextCursor} with at most this many events per call "
+        "instead of one JSON array.",
+    ] = 0,
+    cursor: Annotated[
+        str, "nextCursor from a previous paged call. Other arguments are then ignored."
+    ] = "",
 ) -> str:
-    """List calendar events within a time range. Returns JSON array of events."""
-    service = get_calendar_service()
+    """List calendar events within a time range.
+
+    Returns a JSON array of events, or {events, nextCursor} when page_size is set.
+    """
+    if cursor:
+        with get_cursor_store().resume(cursor, _EventPage) as state:
+            if page_size > 0:
+                state.page_size = page_size
+            return _next_event_page(state)
 
+    now = datetime.now(timezone.utc)
     if not time_min:
-        now = datetime.now(timezone.utc)
         time_min = now.replace(hour=0, minute=0, second=0, microsecond=0).isoformat()
     if not time_max:
-        now = datetime.now(timezone.utc)
         time_max = now.replace(hour=23, minute=59, second=59, microsecond=0).isoformat()
 
     kwargs: dict = {
@@ -117,8 +230,61 @@ def list_events(
     if query:
         kwargs["q"] = query
 
-    result = service.events().list(**kwargs).execute()
-    items = result.get("items", [])
+    items = None
+    # Only the default query shape is prefetched
+    if get_config().prefetch and not query and single_events and order_by == "startTime":
+        from gcal_fast_mcp.prefetch import get_prefetcher
+
+        items = get_prefetcher().lookup(calendar_id, time_min, time_max)
+        if items is not None:
+            items = items[:max_results]
+
+    def from_archive(archive: SnapshotArchive) -> list[dict]:
+        return archive.events(calendar_id, time_min, time_max, query, order_by)[:max_results]
+
+    if page_size > 0:
+        request = {k: v for k, v in kwargs.items() if k != "maxResults"}
+
+        def first_page(items: list[dict] | None) -> str:
+            state = _EventPage(calendar_id, request, page_size, remaining=max_results)
+            if items is not None:
+                state.buffer, state.remaining, state.exhausted = list(items), 0, True
+            return _next_event_page(state)
+
+        return serve_read(
+            lambda: first_page(items), lambda archive: first_page(from_archive(archive))
+        )
+
+    if items is None:
+
+        def live() -> list[dict]:
+            service = get_calendar_service()
+            store = generation = None
+            if get_config().local_availability:
+                from gcal_fast_mcp.availability import get_event_store
+
+                store = get_event_store()
+                generation = store.generation(calendar_id)
+            # Defaults are resolved above so identical concurrent windows share one call
+            result = coalesce(
+                ("events.list", write_generation(calendar_id), tuple(sorted(kwargs.items()))),
+                lambda: service.events().list(**kwargs).execute(),
+            )
+            items = result.get("items", [])
+            # An unfiltered listing with no further page holds every event in the window
+            complete = not query and single_events and "nextPageToken" not in result
+            if complete and store is not None:
+                store.record(
+                    calendar_id,
+                    time_min,
+                    time_max,
+                    items,
+                    result.get("timeZone", ""),
+                    generation=generation,
+                )
+            return items
+
+        items = serve_read(live, from_archive)
     events = [_parse_event(e, calendar_id) for e in items]
 
     return json.dumps(
@@ -128,18 +294,27 @@ def list_events(
 
 
 @mcp.tool(annotations=_READ_ONLY)
+@in_thread
 def get_event(
     event_id: Annotated[str, "The event ID to retrieve."],
     calendar_id: Annotated[str, "Calendar ID. Defaults to primary."] = "primary",
 ) -> str:
     """Get full details of a single calendar event."""
-    service = get_calendar_service()
-    raw = service.events().get(calendarId=calendar_id, eventId=event_id).execute()
+
+    def live() -> dict:
+        service = get_calendar_service()
+        return coalesce(
+            ("events.get", calendar_id, event_id, write_generation(calendar_id)),
+            lambda: service.events().get(calendarId=calendar_id, eventId=event_id).execute(),
+        )
+
+    raw = serve_read(live, lambda archive: archive.get_event(calendar_id, event_id))
     event = _parse_event(raw, calendar_id)
     return json.dumps(event.model_dump(by_alias=True), ensure_ascii=False)
 
 
 @mcp.tool(annotations=_WRITE)
+@in_thread
 def create_event(
     summary: Annotated[str, "Event title."],
     start: Annotated[str, "Start time in ISO 8601 format (e.g. 2025-01-15T09:00:00-05:00)."],
@@ -150,8 +325,6 @@ def create_event(
     calendar_id: Annotated[str, "Calendar ID. Defaults to primary."] = "primary",
 ) -> str:
     """Create a new calendar event."""
-    service = get_calendar_service()
-
     body: dict = {
         "summary": summary,
         "start": {"dateTime": start},
@@ -164,12 +337,18 @@ def create_event(
     if attendees:
         body["attendees"] = [{"email": email} for email in attendees]
 
+    if get_config().write_behind:
+        return _enqueue("create", calendar_id, payload=body)
+
+    service = get_calendar_service()
     raw = service.events().insert(calendarId=calendar_id, body=body).execute()
+    invalidate_cached(calendar_id)
     event = _parse_event(raw, calendar_id)
     return json.dumps(event.model_dump(by_alias=True), ensure_ascii=False)
 
 
 @mcp.tool(annotations=_WRITE)
+@in_thread
 def update_event(
     event_id: Annotated[str, "The event ID to update."],
     summary: Annotated[str | None, "New event title."] = None,
@@ -181,41 +360,46 @@ def update_event(
     calendar_id: Annotated[str, "Calendar ID. Defaults to primary."] = "primary",
 ) -> str:
     """Update an existing calendar event. Only provided fields are changed."""
+    fields = _update_fields(summary, start, end, description, location, attendees)
+
+    if get_config().write_behind:
+        return _enqueue("update", calendar_id, event_id, fields)
+
     service = get_calendar_service()
 
     # Fetch current event to merge changes
     existing = service.events().get(calendarId=calendar_id, eventId=event_id).execute()
-
-    if summary is not None:
-        existing["summary"] = summary
-    if start is not None:
-        existing["start"] = {"dateTime": start}
-    if end is not None:
-        existing["end"] = {"dateTime": end}
-    if description is not None:
-        existing["description"] = description
-    if location is not None:
-        existing["location"] = location
-    if attendees is not None:
-        existing["attendees"] = [{"email": email} for email in attendees]
+    existing.update(fields)
 
     raw = service.events().update(calendarId=calendar_id, eventId=event_id, body=existing).execute()
+    invalidate_cached(calendar_id)
     event = _parse_event(raw, calendar_id)
     return json.dumps(event.model_dump(by_alias=True), ensure_ascii=False)
 
 
 @mcp.tool(annotations=_DELETE)
+@in_thread
 def delete_event(
     event_id: Annotated[str, "The event ID to delete."],
     calendar_id: Annotated[str, "Calendar ID. Defaults to primary."] = "primary",
 ) -> str:
-    """Delete a calendar event."""
+    """Delete a calendar event.
+
+    In write-behind mode, deleting an event whose create or quick_add is still
+    queued and has not been tried returns that operation with status
+    "cancelled": it will not be sent, so the event is never created.
+    """
+    if get_config().write_behind:
+        return _enqueue("delete", calendar_id, event_id)
+
     service = get_calendar_service()
     service.events().delete(calendarId=calendar_id, eventId=event_id).execute()
+    invalidate_cached(calendar_id)
     return f"Event {event_id} deleted successfully."
 
 
 @mcp.tool(annotations=_WRITE)
+@in_thread
 def quick_add(
     text: Annotated[
         str,
@@ -224,7 +408,35 @@ def quick_add(
     calendar_id: Annotated[str, "Calendar ID. Defaults to primary."] = "primary",
 ) -> str:
     """Create an event from a natural language string using Google's NLP parser."""
+    if get_config().write_behind:
+        return _enqueue("quick_add", calendar_id, payload={"text": text})
+
     service = get_calendar_service()
     raw = service.events().quickAdd(calendarId=calendar_id, text=text).execute()
+    invalidate_cached(calendar_id)
     event = _parse_event(raw, calendar_id)
     return json.dumps(event.model_dump(by_alias=True), ensure_ascii=False)
+
+
+@mcp.tool(annotations=_READ_ONLY)
+@in_thread
+def get_operation_status(
+    operation_id: Annotated[
+        str,
+        "Pending operation ID returned by a write tool. Leave empty to list unfinished ones.",
+    ] = "",
+) -> str:
+    """Get the status of queued event mutations when write-behind mode is enabled."""
+    if not get_config().write_behind:
+        return "Write-behind mode is disabled."
+
+    from gcal_fast_mcp.write_behind import get_write_queue
+
+    queue = get_write_queue()
+    if not operation_id:
+        return json.dumps([op.model_dump() for op in queue.list_open()], ensure_ascii=False)
+
+    op = queue.get(operation_id)
+    if op is None:
+        return f"Operation {operation_id} not found."
+    return json.dumps(op.model_dump(), ensure_ascii=False)
@@ -3,10 +3,16 @@
 from __future__ import annotations
 
 import json
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
 from typing import Annotated
 
 from gcal_fast_mcp.calendar_service import get_calendar_service
-from gcal_fast_mcp.server import mcp
+from gcal_fast_mcp.config import get_config
+from gcal_fast_mcp.paging import get_cursor_store
+from gcal_fast_mcp.reads import serve_read
+from gcal_fast_mcp.server import in_thread, mcp
+from gcal_fast_mcp.singleflight import coalesce, write_generation
 from gcal_fast_mcp.types import FreeBusySlot
 
 _READ_ONLY = {
@@ -16,27 +22,129 @@ _READ_ONLY = {
     "openWorldHint": False,
 }
 
+# Paged availability checks query the window in chunks of this length
+_CHUNK = timedelta(days=7)
+
+
+def _query_busy(time_min: str, time_max: str, calendar_ids: list[str]) -> dict:
+    """Return per-calendar busy results, shaped like a freebusy query's ``calendars``.
+
+    Calendars whose events are held locally are computed without an API call;
+    only the rest go to the freebusy endpoint.
+    """
+    local: dict[str, dict] = {}
+    if get_config().local_availability:
+        from gcal_fast_mcp.availability import local_busy
+
+        local = local_busy(time_min, time_max, calendar_ids)
+        calendar_ids = [cal_id for cal_id in calendar_ids if cal_id not in local]
+        if not calendar_ids:
+            return local
+
+    def live() -> dict:
+        service = get_calendar_service()
+        body = {
+            "timeMin": time_min,
+            "timeMax": time_max,
+            "items": [{"id": cal_id} for cal_id in calendar_ids],
+        }
+        generations = tuple(write_generation(cal_id) for cal_id in calendar_ids)
+        result = coalesce(
+            ("freebusy.query", time_min, time_max, tuple(calendar_ids), generations),
+            lambda: service.freebusy().query(body=body).execute(),
+        )
+        return result.get("calendars", {})
+
+    remote = serve_read(live, lambda archive: archive.busy(time_min, time_max, calendar_ids))
+    return {**remote, **local}
+
+
+@dataclass
+class _BusyPage:
+    """Resume state for a paged check_availability call, held server-side behind a cursor."""
+
+    calendar_ids: list[str]
+    next_start: datetime
+    time_max: datetime
+    page_size: int
+    buffer: list[tuple[str, dict]] = field(default_factory=list)
+
+
+def _append_slot(buffer: list[tuple[str, dict]], cal_id: str, slot: dict) -> None:
+    """Buffer a busy slot, rejoining one that was split at a chunk boundary."""
+    for prev_cal, prev in reversed(buffer):
+        if prev_cal != cal_id:
+            continue
+        if datetime.fromisoformat(prev["end"]) == datetime.fromisoformat(slot["start"]):
+            prev["end"] = slot["end"]
+            return
+        break
+    buffer.append((cal_id, slot))
+
+
+def _next_busy_page(state: _BusyPage) -> str:
+    """Return the next page of busy slots as JSON, querying further chunks only as needed."""
+    while len(state.buffer) < state.page_size and state.next_start < state.time_max:
+        chunk_end = min(state.next_start + _CHUNK, state.time_max)
+        calendars_busy = _query_busy(
+            state.next_start.isoformat(), chunk_end.isoformat(), state.calendar_ids
+        )
+        for cal_id in state.calendar_ids:
+            for slot in calendars_busy.get(cal_id, {}).get("busy", []):
+                _append_slot(state.buffer, cal_id, {"start": slot["start"], "end": slot["end"]})
+        state.next_start = chunk_end
+
+    page, state.buffer = state.buffer[: state.page_size], state.buffer[state.page_size :]
+    next_cursor = None
+    if state.buffer or state.next_start < state.time_max:
+        next_cursor = get_cursor_store().put(state)
+
+    output: dict[str, list[dict]] = {cal_id: [] for cal_id in state.calendar_ids}
+    for cal_id, slot in page:
+        output[cal_id].append(FreeBusySlot(**slot).model_dump())
+    return json.dumps({"calendars": output, "nextCursor": next_cursor}, ensure_ascii=False)
+
 
 @mcp.tool(annotations=_READ_ONLY)
+@in_thread
 def check_availability(
-    time_min: Annotated[str, "Start of availability window (ISO 8601)."],
-    time_max: Annotated[str, "End of availability window (ISO 8601)."],
+    time_min: Annotated[str, "Start of availability window (ISO 8601)."] = "",
+    time_max: Annotated[str, "End of availability window (ISO 8601)."] = "",
     calendars: Annotated[
         list[str] | None, "Calendar IDs to check. Defaults to ['primary']."
     ] = None,
+    page_size: Annotated[
+        int,
+        "If set, return {calendars, nextCursor} with at most this many busy slots per call, "
+        "scanning long windows a week at a time.",
+    ] = 0,
+    cursor: Annotated[
+        str, "nextCursor from a previous paged call. Other arguments are then ignored."
+    ] = "",
 ) -> str:
     """Check free/busy status for one or more calendars. Returns busy time ranges per calendar."""
-    service = get_calendar_service()
-    calendar_ids = calendars or ["primary"]
+    if cursor:
+        with get_cursor_store().resume(cursor, _BusyPage) as state:
+            if page_size > 0:
+                state.page_size = page_size
+            return _next_busy_page(state)
+
+    if not time_min or not time_max:
+        raise ValueError("time_min and time_max are required.")
+
+    # Order and duplicates don't change the answer, so normalize them for coalescing
+    calendar_ids = sorted(set(calendars or ["primary"]))
 
-    body = {
-        "timeMin": time_min,
-        "timeMax": time_max,
-        "items": [{"id": cal_id} for cal_id in calendar_ids],
-    }
+    if page_size > 0:
+        state = _BusyPage(
+            calendar_ids,
+            next_start=datetime.fromisoformat(time_min),
+            time_max=datetime.fromisoformat(time_max),
+            page_size=page_size,
+        )
+        return _next_busy_page(state)
 
-    result = service.freebusy().query(body=body).execute()
-    calendars_busy = result.get("calendars", {})
+    calendars_busy = _query_busy(time_min, time_max, calendar_ids)
 
     output: dict[str, list[dict]] = {}
     for cal_id, info in calendars_busy.items():
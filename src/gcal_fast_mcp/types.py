@@ -57,3 +57,18 @@ class Event(BaseModel):
 class FreeBusySlot(BaseModel):
     start: str = Field(description="Busy period start (ISO 8601)")
     end: str = Field(description="Busy period end (ISO 8601)")
+
+
+class PendingOperation(BaseModel):
+    id: str = Field(description="Pending operation identifier")
+    operation: str = Field(description="Mutation type: create, quick_add, update, delete")
+    calendar_id: str = Field(default="", description="Calendar the mutation applies to")
+    event_id: str = Field(
+        default="", description="Target event ID, or the pending ID of a queued quick_add"
+    )
+    status: str = Field(description="Operation status: pending, running, done, failed, cancelled")
+    attempts: int = Field(default=0, description="Number of flush attempts so far")
+    error: str = Field(default="", description="Last error message, if any")
+    result_event_id: str = Field(
+        default="", description="ID of the created or updated event once applied"
+    )
@@ -0,0 +1,418 @@
+"""Durable write-behind queue for event mutations.
+
+Mutations are journaled to a local SQLite database and the caller gets a
+pending operation straight away. A background flusher sends queued operations
+to the Calendar API in batch requests, retrying transient failures with
+exponential backoff. Operations queued against the same event are coalesced
+while they wait: successive updates merge into one patch, an update to a
+queued create is folded into the create, and deleting a queued create cancels
+both. A create that has already been tried (including one interrupted by a
+restart) may exist on the server, so later operations on it are queued
+separately instead.
+
+Creates, updates and deletes are safe to resend: creates carry a
+client-chosen event ID, patches are idempotent, and a repeated delete gets a
+404. quick_add is not, because the server picks the event ID, so it is only
+retried after a rate limit and fails on any error that leaves its outcome
+unknown.
+
+Caches of calendar events are invalidated through ``on_applied`` once the API
+has accepted a write, not when it is queued.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from .types import PendingOperation
+
+logger = logging.getLogger(__name__)
+
+PENDING_PREFIX = "pending_"
+BATCH_SIZE = 50
+
+_BACKOFF_BASE = 1.0
+_BACKOFF_MAX = 300.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS operations (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT UNIQUE NOT NULL,
+    operation TEXT NOT NULL,
+    calendar_id TEXT NOT NULL,
+    event_id TEXT NOT NULL DEFAULT '',
+    payload TEXT NOT NULL DEFAULT '{}',
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt REAL NOT NULL DEFAULT 0,
+    error TEXT NOT NULL DEFAULT '',
+    result_event_id TEXT NOT NULL DEFAULT ''
+)
+"""
+
+
+def _http_status(exc: BaseException) -> int | None:
+    """Return the HTTP status of a googleapiclient HttpError, or None."""
+    status = getattr(getattr(exc, "resp", None), "status", None)
+    return int(status) if status is not None else None
+
+
+def _already_applied(operation: str, exc: BaseException) -> bool:
+    """Whether an error means a retried operation had in fact succeeded earlier."""
+    status = _http_status(exc)
+    if operation == "create":
+        return status == 409
+    if operation == "delete":
+        return status in (404, 410)
+    return False
+
+
+def _is_permanent(exc: BaseException) -> bool:
+    status = _http_status(exc)
+    return status is not None and 400 <= status < 500 and status not in (408, 429)
+
+
+class _NotSent(Exception):
+    """A batch that failed before any request left the process."""
+
+
+def _outcome_unknown(exc: BaseException) -> bool:
+    """Whether a failed request may still have been applied by the server."""
+    if isinstance(exc, _NotSent):
+        return False
+    return _http_status(exc) != 429 and not _is_permanent(exc)
+
+
+def _to_model(row: sqlite3.Row) -> PendingOperation:
+    return PendingOperation(
+        id=row["id"],
+        operation=row["operation"],
+        calendar_id=row["calendar_id"],
+        event_id=row["event_id"],
+        status=row["status"],
+        attempts=row["attempts"],
+        error=row["error"],
+        result_event_id=row["result_event_id"],
+    )
+
+
+class WriteBehindQueue:
+    """Journal of pending event mutations with a background batch flusher."""
+
+    def __init__(
+        self,
+        path: str | Path,
+        service_factory: Callable[[], Any],
+        *,
+        flush_interval: float = 1.0,
+        max_attempts: int = 8,
+        clock: Callable[[], float] = time.time,
+        on_applied: Callable[[str], None] | None = None,
+    ) -> None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=FULL")
+        self._db.execute(_SCHEMA)
+        # Operations interrupted mid-flush by a restart may have reached the
+        # server. Resendable ones go back in the queue counted as tried;
+        # a quick_add cannot be resent without risking a duplicate event.
+        self._db.execute(
+            "UPDATE operations SET status = 'failed', attempts = attempts + 1, "
+            "error = 'Interrupted by a restart (not retried: the event may have been created)' "
+            "WHERE status = 'running' AND operation = 'quick_add'"
+        )
+        self._db.execute(
+            "UPDATE operations SET status = 'pending', attempts = attempts + 1 "
+            "WHERE status = 'running'"
+        )
+
+        self._lock = threading.Lock()
+        self._service_factory = service_factory
+        self._service = None
+        self._flush_interval = flush_interval
+        self._max_attempts = max_attempts
+        self._clock = clock
+        self._on_applied = on_applied
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    # -- Journal -------------------------------------------------------------
+
+    def enqueue(
+        self,
+        operation: str,
+        calendar_id: str,
+        event_id: str = "",
+        payload: dict | None = None,
+    ) -> PendingOperation:
+        """Journal a mutation, coalescing it with a queued one for the same event."""
+        payload = dict(payload or {})
+        if operation == "create":
+            # A client-chosen event ID makes inserts safe to retry and lets
+            # callers refer to the event before it reaches the API.
+            payload.setdefault("id", uuid.uuid4().hex)
+            event_id = payload["id"]
+
+        with self._lock:
+            last = self._last_open(calendar_id, event_id) if event_id else None
+            if last is not None and last["status"] == "pending":
+                merged = self._coalesce(last, operation, payload)
+                if merged is not None:
+                    return merged
+
+            op_id = f"{PENDING_PREFIX}{uuid.uuid4().hex}"
+            self._db.execute(
+                "INSERT INTO operations (id, operation, calendar_id, event_id, payload) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (op_id, operation, calendar_id, event_id, json.dumps(payload)),
+            )
+            return _to_model(self._row(op_id))
+
+    def get(self, op_id: str) -> PendingOperation | None:
+        with self._lock:
+            row = self._row(op_id)
+        return _to_model(row) if row is not None else None
+
+    def list_open(self) -> list[PendingOperation]:
+        """Return operations that have not finished, oldest first."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT * FROM operations WHERE status IN ('pending', 'running') ORDER BY seq"
+            ).fetchall()
+        return [_to_model(r) for r in rows]
+
+    def _row(self, op_id: str) -> sqlite3.Row | None:
+        return self._db.execute("SELECT * FROM operations WHERE id = ?", (op_id,)).fetchone()
+
+    def _last_open(self, calendar_id: str, target: str) -> sqlite3.Row | None:
+        """Most recent unfinished operation on an event ID or a queued quick_add's ID."""
+        return self._db.execute(
+            "SELECT * FROM operations WHERE calendar_id = ? AND (event_id = ? OR id = ?) "
+            "AND status IN ('pending', 'running') ORDER BY seq DESC LIMIT 1",
+            (calendar_id, target, target),
+        ).fetchone()
+
+    def _coalesce(
+        self, last: sqlite3.Row, operation: str, payload: dict
+    ) -> PendingOperation | None:
+        """Fold a new operation into the queued ``last`` one, if they combine."""
+        # A retried insert that was applied comes back as a 409 and is not
+        # resent, so nothing may be folded into a create once it has been tried
+        untried = last["attempts"] == 0
+        creates = ("create", "quick_add")
+        if operation == "update" and (
+            last["operation"] == "update" or (last["operation"] == "create" and untried)
+        ):
+            merged = {**json.loads(last["payload"]), **payload}
+            self._db.execute(
+                "UPDATE operations SET payload = ? WHERE id = ?",
+                (json.dumps(merged), last["id"]),
+            )
+        elif operation == "delete" and last["operation"] == "update":
+            self._db.execute(
+                "UPDATE operations SET operation = 'delete', payload = '{}' WHERE id = ?",
+                (last["id"],),
+            )
+        elif operation == "delete" and last["operation"] in creates and untried:
+            self._db.execute(
+                "UPDATE operations SET status = 'cancelled' WHERE id = ?",
+                (last["id"],),
+            )
+        else:
+            return None
+        return _to_model(self._row(last["id"]))
+
+    # -- Flushing ------------------------------------------------------------
+
+    def flush(self) -> int:
+        """Send one batch of due operations. Returns the number of operations sent."""
+        now = self._clock()
+        with self._lock:
+            ready = self._claim_ready(now)
+        if not ready:
+            return 0
+
+        results: dict[str, tuple[Any, BaseException | None]] = {}
+
+        def callback(request_id: str, response: Any, exception: BaseException | None) -> None:
+            results[request_id] = (response, exception)
+
+        try:
+            if self._service is None:
+                self._service = self._service_factory()
+            batch = self._service.new_batch_http_request(callback=callback)
+            for row in ready:
+                batch.add(self._request(row), request_id=row["id"])
+        except Exception as exc:
+            for row in ready:
+                results[row["id"]] = (None, _NotSent(exc))
+        else:
+            try:
+                batch.execute()
+            except Exception as exc:
+                for row in ready:
+                    results.setdefault(row["id"], (None, exc))
+
+        applied: list[str] = []
+        with self._lock:
+            for row in ready:
+                response, exc = results.get(row["id"], (None, RuntimeError("No response in batch")))
+                if self._record(row, response, exc, now):
+                    applied.append(row["calendar_id"])
+        if self._on_applied is not None:
+            for calendar_id in dict.fromkeys(applied):
+                try:
+                    self._on_applied(calendar_id)
+                except Exception:
+                    logger.exception("Write-behind completion hook failed for %s", calendar_id)
+        return len(ready)
+
+    def _claim_ready(self, now: float) -> list[sqlite3.Row]:
+        """Pick due operations, at most one per event, and mark them running."""
+        rows = self._db.execute(
+            "SELECT * FROM operations WHERE status = 'pending' ORDER BY seq"
+        ).fetchall()
+
+        ready: list[sqlite3.Row] = []
+        seen: set[tuple[str, str]] = set()
+        for row in rows:
+            target = row["event_id"]
+            if target.startswith(PENDING_PREFIX):
+                dep = self._row(target)
+                if dep is None or dep["status"] in ("failed", "cancelled"):
+                    state = dep["status"] if dep is not None else "missing"
+                    self._db.execute(
+                        "UPDATE operations SET status = 'failed', error = ? WHERE id = ?",
+                        (f"Depends on operation {target}, which is {state}.", row["id"]),
+                    )
+                    continue
+                if dep["status"] == "done":
+                    target = dep["result_event_id"]
+                    self._db.execute(
+                        "UPDATE operations SET event_id = ? WHERE id = ?", (target, row["id"])
+                    )
+                    row = self._row(row["id"])
+
+            # Keep per-event ordering: later operations wait for earlier ones
+            key = (row["calendar_id"], target or row["id"])
+            if key in seen:
+                continue
+            seen.add(key)
+            if target.startswith(PENDING_PREFIX) or row["next_attempt"] > now:
+                continue
+
+            ready.append(row)
+            if len(ready) >= BATCH_SIZE:
+                break
+
+        self._db.executemany(
+            "UPDATE operations SET status = 'running' WHERE id = ?",
+            [(row["id"],) for row in ready],
+        )
+        return ready
+
+    def _request(self, row: sqlite3.Row) -> Any:
+        events = self._service.events()
+        calendar_id = row["calendar_id"]
+        payload = json.loads(row["payload"])
+        operation = row["operation"]
+        if operation == "create":
+            return events.insert(calendarId=calendar_id, body=payload)
+        if operation == "quick_add":
+            return events.quickAdd(calendarId=calendar_id, text=payload["text"])
+        if operation == "update":
+            return events.patch(calendarId=calendar_id, eventId=row["event_id"], body=payload)
+        if operation == "delete":
+            return events.delete(calendarId=calendar_id, eventId=row["event_id"])
+        raise ValueError(f"Unknown operation: {operation}")
+
+    def _record(
+        self, row: sqlite3.Row, response: Any, exc: BaseException | None, now: float
+    ) -> bool:
+        """Store the outcome of one attempt. Returns True if the operation is done."""
+        attempts = row["attempts"] + 1
+        if exc is None or _already_applied(row["operation"], exc):
+            event_id = (response or {}).get("id") or row["event_id"]
+            self._db.execute(
+                "UPDATE operations SET status = 'done', attempts = ?, error = '', "
+                "result_event_id = ? WHERE id = ?",
+                (attempts, event_id, row["id"]),
+            )
+            return True
+        if row["operation"] == "quick_add" and _outcome_unknown(exc):
+            self._db.execute(
+                "UPDATE operations SET status = 'failed', attempts = ?, error = ? WHERE id = ?",
+                (attempts, f"{exc} (not retried: the event may have been created)", row["id"]),
+            )
+        elif _is_permanent(exc) or attempts >= self._max_attempts:
+            self._db.execute(
+                "UPDATE operations SET status = 'failed', attempts = ?, error = ? WHERE id = ?",
+                (attempts, str(exc), row["id"]),
+            )
+        else:
+            delay = min(_BACKOFF_BASE * 2 ** (attempts - 1), _BACKOFF_MAX)
+            self._db.execute(
+                "UPDATE operations SET status = 'pending', attempts = ?, error = ?, "
+                "next_attempt = ? WHERE id = ?",
+                (attempts, str(exc), now + delay, row["id"]),
+            )
+        return False
+
+    # -- Background thread ---------------------------------------------------
+
+    def start(self) -> None:
+        """Start the background flusher if it is not already running."""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="gcal-write-behind", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float | None = None) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._flush_interval):
+            try:
+                while self.flush() >= BATCH_SIZE:
+                    pass
+            except Exception:
+                logger.exception("Write-behind flush failed")
+
+
+_queue: WriteBehindQueue | None = None
+_queue_lock = threading.Lock()
+
+
+def get_write_queue() -> WriteBehindQueue:
+    """Return the process-wide write-behind queue, starting its flusher on first call."""
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            from .calendar_service import build_calendar_service
+            from .config import get_config
+            from .reads import invalidate_cached
+
+            config = get_config()
+            _queue = WriteBehindQueue(
+                config.journal_path,
+                build_calendar_service,
+                flush_interval=config.flush_interval,
+                max_attempts=config.flush_max_attempts,
+                on_applied=invalidate_cached,
+            )
+            _queue.start()
+    return _queue
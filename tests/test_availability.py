@@ -0,0 +1,262 @@
+"""Tests for free/busy computed from locally held events."""
+
+from __future__ import annotations
+
+import json
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+
+import pytest
+
+from gcal_fast_mcp import availability
+from gcal_fast_mcp.availability import LocalEventStore, busy_intervals
+from gcal_fast_mcp.config import Config
+from gcal_fast_mcp.prefetch import Prefetcher
+from gcal_fast_mcp.reads import invalidate_cached
+from gcal_fast_mcp.tools.event_ops import create_event, delete_event, list_events
+from gcal_fast_mcp.tools.freebusy_ops import check_availability
+from gcal_fast_mcp.write_behind import WriteBehindQueue
+
+DAY_START = datetime(2025, 1, 15, tzinfo=timezone.utc)
+DAY_END = datetime(2025, 1, 16, tzinfo=timezone.utc)
+
+
+def _timed(event_id, start, end, **extra):
+    return {"id": event_id, "start": {"dateTime": start}, "end": {"dateTime": end}, **extra}
+
+
+def _slot(start, end):
+    return {"start": start, "end": end}
+
+
+class TestBusyIntervals:
+    def test_skips_free_time(self):
+        events = [
+            _timed("a", "2025-01-15T09:00:00Z", "2025-01-15T10:00:00Z"),
+            _timed("b", "2025-01-15T11:00:00Z", "2025-01-15T12:00:00Z", transparency="transparent"),
+            _timed("c", "2025-01-15T12:00:00Z", "2025-01-15T13:00:00Z", status="cancelled"),
+            _timed(
+                "d",
+                "2025-01-15T14:00:00Z",
+                "2025-01-15T15:00:00Z",
+                attendees=[{"email": "me@example.com", "responseStatus": "declined"}],
+            ),
+        ]
+        busy = busy_intervals(events, "me@example.com", DAY_START, DAY_END)
+        assert busy == [_slot("2025-01-15T09:00:00Z", "2025-01-15T10:00:00Z")]
+
+    def test_declined_by_self_on_primary(self):
+        attendees = [
+            {"email": "other@example.com", "responseStatus": "accepted"},
+            {"email": "me@example.com", "self": True, "responseStatus": "declined"},
+        ]
+        events = [_timed("a", "2025-01-15T09:00:00Z", "2025-01-15T10:00:00Z", attendees=attendees)]
+        assert busy_intervals(events, "primary", DAY_START, DAY_END) == []
+        # Someone else declining does not free the owner's time
+        assert busy_intervals(events, "other@example.com", DAY_START, DAY_END) != []
+
+    def test_merges_and_clips(self):
+        events = [
+            _timed("a", "2025-01-14T23:00:00Z", "2025-01-15T01:00:00Z"),
+            _timed("b", "2025-01-15T00:30:00-00:00", "2025-01-15T02:00:00Z"),
+        ]
+        busy = busy_intervals(events, "primary", DAY_START, DAY_END)
+        assert busy == [_slot("2025-01-15T00:00:00Z", "2025-01-15T02:00:00Z")]
+
+    def test_all_day_uses_calendar_time_zone(self, sample_allday_event_raw):
+        busy = busy_intervals(
+            [sample_allday_event_raw],
+            "primary",
+            datetime(2025, 1, 19, tzinfo=timezone.utc),
+            datetime(2025, 1, 22, tzinfo=timezone.utc),
+            "America/New_York",
+        )
+        assert busy == [_slot("2025-01-20T05:00:00Z", "2025-01-21T05:00:00Z")]
+
+
+class TestLocalEventStore:
+    @pytest.fixture
+    def clock(self):
+        return [0.0]
+
+    @pytest.fixture
+    def store(self, clock):
+        return LocalEventStore(ttl=60, clock=lambda: clock[0])
+
+    def test_uncovered_range(self, store):
+        store.record("primary", "2025-01-15T00:00:00Z", "2025-01-15T12:00:00Z", [])
+        assert store.busy("primary", DAY_START, DAY_END) is None
+        assert store.busy("other", DAY_START, DAY_END) is None
+
+    def test_adjacent_windows_cover_range(self, store):
+        store.record(
+            "primary",
+            "2025-01-15T00:00:00Z",
+            "2025-01-15T11:59:59Z",
+            [_timed("a", "2025-01-15T09:00:00Z", "2025-01-15T10:00:00Z")],
+        )
+        store.record(
+            "primary",
+            "2025-01-15T12:00:00Z",
+            "2025-01-16T00:00:00Z",
+            [_timed("a", "2025-01-15T09:00:00Z", "2025-01-15T10:00:00Z")],
+        )
+        busy = store.busy("primary", DAY_START, DAY_END)
+        assert busy == [_slot("2025-01-15T09:00:00Z", "2025-01-15T10:00:00Z")]
+
+    def test_expiry(self, store, clock):
+        store.record("primary", "2025-01-15T00:00:00Z", "2025-01-16T00:00:00Z", [])
+        assert store.busy("primary", DAY_START, DAY_END) == []
+        clock[0] = 61
+        assert store.busy("primary", DAY_START, DAY_END) is None
+
+    def test_listing_fetched_before_invalidation_is_dropped(self, store):
+        generation = store.generation("primary")
+        store.invalidate("primary")
+        store.record(
+            "primary", "2025-01-15T00:00:00Z", "2025-01-16T00:00:00Z", [], generation=generation
+        )
+        assert store.busy("primary", DAY_START, DAY_END) is None
+
+    def test_invalidate(self, store):
+        store.record("primary", "2025-01-15T00:00:00Z", "2025-01-16T00:00:00Z", [])
+        store.invalidate("primary")
+        assert store.busy("primary", DAY_START, DAY_END) is None
+
+
+class TestCheckAvailabilityLocally:
+    @pytest.fixture(autouse=True)
+    def local(self, monkeypatch):
+        config = Config(local_availability=True)
+        for module in ("config", "tools.event_ops", "tools.freebusy_ops"):
+            monkeypatch.setattr(f"gcal_fast_mcp.{module}.get_config", lambda: config)
+        store = LocalEventStore()
+        monkeypatch.setattr(availability, "_store", store)
+        return store
+
+    async def _list_day(self, service):
+        service.events().list().execute.return_value = {
+            "items": [_timed("a", "2025-01-15T09:00:00Z", "2025-01-15T10:00:00Z")],
+            "timeZone": "UTC",
+        }
+        await list_events.fn(time_min="2025-01-15T00:00:00Z", time_max="2025-01-16T00:00:00Z")
+
+    async def test_served_without_freebusy_call(self, mock_calendar_service):
+        await self._list_day(mock_calendar_service)
+        data = json.loads(
+            await check_availability.fn(
+                time_min="2025-01-15T08:00:00Z", time_max="2025-01-15T18:00:00Z"
+            )
+        )
+        assert data == {"primary": [_slot("2025-01-15T09:00:00Z", "2025-01-15T10:00:00Z")]}
+        assert not mock_calendar_service.freebusy().query.called
+
+    async def test_queries_only_uncovered_calendars(self, mock_calendar_service):
+        await self._list_day(mock_calendar_service)
+        query = mock_calendar_service.freebusy().query
+        query.return_value.execute.return_value = {"calendars": {"team@example.com": {"busy": []}}}
+        data = json.loads(
+            await check_availability.fn(
+                time_min="2025-01-15T08:00:00Z",
+                time_max="2025-01-15T18:00:00Z",
+                calendars=["primary", "team@example.com"],
+            )
+        )
+        assert data["team@example.com"] == []
+        assert len(data["primary"]) == 1
+        assert query.call_args.kwargs["body"]["items"] == [{"id": "team@example.com"}]
+
+    async def test_filtered_listing_is_not_recorded(self, local, mock_calendar_service):
+        mock_calendar_service.events().list().execute.return_value = {"items": []}
+        await list_events.fn(
+            time_min="2025-01-15T00:00:00Z", time_max="2025-01-16T00:00:00Z", query="lunch"
+        )
+        assert local.busy("primary", DAY_START, DAY_END) is None
+
+    async def test_listing_racing_a_write_is_not_recorded(self, local, mock_calendar_service):
+        def execute():
+            # A write is applied while the listing is in flight
+            invalidate_cached("primary")
+            return {"items": []}
+
+        mock_calendar_service.events().list().execute.side_effect = execute
+        await list_events.fn(time_min="2025-01-15T00:00:00Z", time_max="2025-01-16T00:00:00Z")
+        assert local.busy("primary", DAY_START, DAY_END) is None
+
+    async def test_write_invalidates(self, local, mock_calendar_service):
+        await self._list_day(mock_calendar_service)
+        await delete_event.fn(event_id="a")
+        assert local.busy("primary", DAY_START, DAY_END) is None
+
+
+class _Batch:
+    """Batch request stand-in that applies every queued operation."""
+
+    def __init__(self, callback):
+        self._callback = callback
+        self._ids = []
+
+    def add(self, request, request_id):
+        self._ids.append(request_id)
+
+    def execute(self):
+        for request_id in self._ids:
+            self._callback(request_id, {"id": "new"}, None)
+
+
+class TestWriteBehindWithLocalAvailability:
+    @pytest.fixture
+    def setup(self, tmp_path, monkeypatch, mock_calendar_service):
+        config = Config(write_behind=True, prefetch=True, local_availability=True)
+        for module in ("config", "tools.event_ops", "tools.freebusy_ops"):
+            monkeypatch.setattr(f"gcal_fast_mcp.{module}.get_config", lambda: config)
+
+        store = LocalEventStore()
+        monkeypatch.setattr(availability, "_store", store)
+
+        server_events = [_timed("a", "2025-01-15T09:00:00Z", "2025-01-15T10:00:00Z")]
+        api = MagicMock()
+        api.events().list().execute.side_effect = lambda: {"items": list(server_events)}
+        prefetcher = Prefetcher(
+            lambda: api,
+            windows=["today"],
+            calendars=["primary"],
+            clock=lambda: 1000.0,
+            now=lambda: datetime(2025, 1, 15, 7, tzinfo=timezone.utc),
+            store=store,
+        )
+        monkeypatch.setattr("gcal_fast_mcp.prefetch.get_prefetcher", lambda: prefetcher)
+
+        queue = WriteBehindQueue(
+            tmp_path / "journal.sqlite3",
+            lambda: MagicMock(new_batch_http_request=_Batch),
+            on_applied=invalidate_cached,
+        )
+        monkeypatch.setattr("gcal_fast_mcp.write_behind.get_write_queue", lambda: queue)
+
+        prefetcher.refresh_due()
+        return prefetcher, queue, server_events
+
+    async def _busy(self):
+        data = await check_availability.fn(
+            time_min="2025-01-15T08:00:00Z", time_max="2025-01-15T18:00:00Z"
+        )
+        return json.loads(data)["primary"]
+
+    async def test_new_event_is_busy_after_flush(self, setup, mock_calendar_service):
+        prefetcher, queue, server_events = setup
+        await create_event.fn(
+            summary="Interview", start="2025-01-15T14:00:00Z", end="2025-01-15T15:00:00Z"
+        )
+        # Queuing the write must not trigger a refetch of pre-write events
+        assert prefetcher.refresh_due() == 0
+
+        server_events.append(_timed("new", "2025-01-15T14:00:00Z", "2025-01-15T15:00:00Z"))
+        queue.flush()
+        assert prefetcher.refresh_due() == 1
+
+        assert await self._busy() == [
+            _slot("2025-01-15T09:00:00Z", "2025-01-15T10:00:00Z"),
+            _slot("2025-01-15T14:00:00Z", "2025-01-15T15:00:00Z"),
+        ]
+        assert not mock_calendar_service.freebusy().query.called
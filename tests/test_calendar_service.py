@@ -0,0 +1,70 @@
+"""Tests for the shared Calendar API credentials."""
+
+from __future__ import annotations
+
+import json
+import threading
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from gcal_fast_mcp import calendar_service
+from gcal_fast_mcp.config import Config
+
+
+@pytest.fixture
+def token_file(tmp_path, monkeypatch):
+    """An expired saved token, with the shared credentials reset."""
+    path = tmp_path / "credentials.json"
+    path.write_text(
+        json.dumps(
+            {
+                "token": "old",
+                "refresh_token": "refresh",
+                "client_id": "id",
+                "client_secret": "secret",
+                "expiry": (datetime.now(UTC) - timedelta(hours=1)).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            }
+        )
+    )
+    config = Config(credentials_path=str(path), oauth_path=str(tmp_path / "missing.json"))
+    monkeypatch.setattr("gcal_fast_mcp.config.get_config", lambda: config)
+    monkeypatch.setattr(calendar_service, "_credentials", None)
+    return path
+
+
+class TestSharedCredentials:
+    def test_concurrent_threads_refresh_once(self, token_file, monkeypatch):
+        from google.oauth2.credentials import Credentials
+
+        refreshes = []
+
+        def refresh(self, request):
+            refreshes.append(threading.get_ident())
+            self.token = "new"
+            # google-auth keeps expiry as naive UTC
+            self.expiry = (datetime.now(UTC) + timedelta(hours=1)).replace(tzinfo=None)
+
+        monkeypatch.setattr(Credentials, "refresh", refresh)
+
+        barrier = threading.Barrier(8)
+        results = []
+
+        def worker():
+            barrier.wait()
+            results.append(calendar_service.get_credentials())
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(refreshes) == 1
+        assert len({id(creds) for creds in results}) == 1
+        assert json.loads(token_file.read_text())["token"] == "new"
+
+    def test_missing_token_file(self, token_file):
+        token_file.unlink()
+        with pytest.raises(RuntimeError, match="No credentials found"):
+            calendar_service.get_credentials()
@@ -55,36 +55,36 @@ class TestParseEvent:
 
 
 class TestListEvents:
-    def test_list_events_returns_json(self, mock_calendar_service, sample_event_raw):
+    async def test_list_events_returns_json(self, mock_calendar_service, sample_event_raw):
         mock_calendar_service.events().list().execute.return_value = {"items": [sample_event_raw]}
 
-        result = list_events.fn(calendar_id="primary")
+        result = await list_events.fn(calendar_id="primary")
         data = json.loads(result)
         assert isinstance(data, list)
         assert len(data) == 1
         assert data[0]["id"] == "evt_123"
 
-    def test_list_events_empty(self, mock_calendar_service):
+    async def test_list_events_empty(self, mock_calendar_service):
         mock_calendar_service.events().list().execute.return_value = {"items": []}
 
-        result = list_events.fn(calendar_id="primary")
+        result = await list_events.fn(calendar_id="primary")
         assert json.loads(result) == []
 
 
 class TestGetEvent:
-    def test_get_event(self, mock_calendar_service, sample_event_raw):
+    async def test_get_event(self, mock_calendar_service, sample_event_raw):
         mock_calendar_service.events().get().execute.return_value = sample_event_raw
 
-        result = get_event.fn(event_id="evt_123", calendar_id="primary")
+        result = await get_event.fn(event_id="evt_123", calendar_id="primary")
         data = json.loads(result)
         assert data["id"] == "evt_123"
         assert data["summary"] == "Team standup"
 
 
 class TestDeleteEvent:
-    def test_delete_event(self, mock_calendar_service):
+    async def test_delete_event(self, mock_calendar_service):
         mock_calendar_service.events().delete().execute.return_value = None
 
-        result = delete_event.fn(event_id="evt_123", calendar_id="primary")
+        result = await delete_event.fn(event_id="evt_123", calendar_id="primary")
         assert "evt_123" in result
         assert "deleted" in result.lower()
@@ -0,0 +1,174 @@
+"""Tests for cursor-based paging of tool results."""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from gcal_fast_mcp import paging
+from gcal_fast_mcp.paging import CursorStore
+from gcal_fast_mcp.tools.event_ops import list_events
+from gcal_fast_mcp.tools.freebusy_ops import check_availability
+
+
+@pytest.fixture(autouse=True)
+def cursor_store(monkeypatch):
+    store = CursorStore()
+    monkeypatch.setattr(paging, "_store", store)
+    return store
+
+
+def _events(start, n):
+    return [
+        {
+            "id": f"evt_{i}",
+            "start": {"dateTime": "2025-01-15T09:00:00Z"},
+            "end": {"dateTime": "2025-01-15T10:00:00Z"},
+        }
+        for i in range(start, start + n)
+    ]
+
+
+def _busy(*slots):
+    """A freebusy response with the given (start, end) busy slots on the primary calendar."""
+    return {"calendars": {"primary": {"busy": [{"start": s, "end": e} for s, e in slots]}}}
+
+
+class TestCursorStore:
+    def test_take_is_single_use(self):
+        store = CursorStore()
+        cursor = store.put({"a": 1})
+        assert store.take(cursor, dict) == {"a": 1}
+        with pytest.raises(ValueError):
+            store.take(cursor, dict)
+
+    def test_expired_cursor(self):
+        now = [0.0]
+        store = CursorStore(ttl=10, clock=lambda: now[0])
+        cursor = store.put({})
+        now[0] = 11
+        with pytest.raises(ValueError):
+            store.take(cursor, dict)
+        assert len(store) == 0
+
+    def test_bounded(self):
+        store = CursorStore(max_cursors=2)
+        first = store.put({})
+        store.put({})
+        store.put({})
+        assert len(store) == 2
+        with pytest.raises(ValueError):
+            store.take(first, dict)
+
+    def test_resume_restores_state_on_error(self):
+        store = CursorStore()
+        cursor = store.put({"a": 1})
+        with pytest.raises(OSError), store.resume(cursor, dict):
+            raise OSError("upstream failed")
+        with store.resume(cursor, dict) as state:
+            assert state == {"a": 1}
+        assert len(store) == 0
+
+    def test_wrong_kind(self):
+        store = CursorStore()
+        cursor = store.put([])
+        with pytest.raises(ValueError):
+            store.take(cursor, dict)
+
+
+class TestListEventsPaging:
+    async def test_unpaged_call_returns_array(self, mock_calendar_service):
+        mock_calendar_service.events().list().execute.return_value = {"items": _events(0, 3)}
+        assert len(json.loads(await list_events.fn())) == 3
+
+    async def test_pages_resume_from_buffer_and_token(self, mock_calendar_service):
+        execute = mock_calendar_service.events().list().execute
+        execute.side_effect = [
+            {"items": _events(0, 5), "nextPageToken": "tok2"},
+            {"items": _events(5, 2)},
+        ]
+
+        first = json.loads(await list_events.fn(page_size=3, max_results=100))
+        assert [e["id"] for e in first["events"]] == ["evt_0", "evt_1", "evt_2"]
+        assert execute.call_count == 1
+
+        # Buffered events come first, then the upstream page token is followed
+        second = json.loads(await list_events.fn(cursor=first["nextCursor"]))
+        assert [e["id"] for e in second["events"]] == ["evt_3", "evt_4", "evt_5"]
+        assert execute.call_count == 2
+        assert mock_calendar_service.events().list.call_args.kwargs["pageToken"] == "tok2"
+
+        third = json.loads(await list_events.fn(cursor=second["nextCursor"]))
+        assert [e["id"] for e in third["events"]] == ["evt_6"]
+        assert third["nextCursor"] is None
+        assert execute.call_count == 2
+
+    async def test_max_results_caps_total(self, mock_calendar_service):
+        mock_calendar_service.events().list().execute.return_value = {
+            "items": _events(0, 10),
+            "nextPageToken": "more",
+        }
+        page = json.loads(await list_events.fn(page_size=4, max_results=4))
+        assert len(page["events"]) == 4
+        assert page["nextCursor"] is None
+
+    async def test_cursor_survives_failed_fetch(self, mock_calendar_service):
+        execute = mock_calendar_service.events().list().execute
+        execute.side_effect = [
+            {"items": _events(0, 3), "nextPageToken": "tok2"},
+            OSError("connection reset"),
+            {"items": _events(3, 2)},
+        ]
+        first = json.loads(await list_events.fn(page_size=3, max_results=100))
+
+        with pytest.raises(OSError):
+            await list_events.fn(cursor=first["nextCursor"])
+        second = json.loads(await list_events.fn(cursor=first["nextCursor"]))
+        assert [e["id"] for e in second["events"]] == ["evt_3", "evt_4"]
+        assert mock_calendar_service.events().list.call_args.kwargs["pageToken"] == "tok2"
+
+    async def test_unknown_cursor(self, mock_calendar_service):
+        with pytest.raises(ValueError):
+            await list_events.fn(cursor="nope")
+
+
+class TestCheckAvailabilityPaging:
+    async def test_scans_window_in_chunks(self, mock_calendar_service):
+        query = mock_calendar_service.freebusy().query
+        query.return_value.execute.side_effect = [
+            _busy(("2025-01-02T09:00:00Z", "2025-01-02T10:00:00Z")),
+            _busy(("2025-01-09T09:00:00Z", "2025-01-09T10:00:00Z")),
+            _busy(),
+        ]
+
+        first = json.loads(
+            await check_availability.fn(
+                time_min="2025-01-01T00:00:00Z", time_max="2025-01-20T00:00:00Z", page_size=1
+            )
+        )
+        assert first["calendars"]["primary"][0]["start"] == "2025-01-02T09:00:00Z"
+        assert query.return_value.execute.call_count == 1
+        assert query.call_args.kwargs["body"]["timeMax"] == "2025-01-08T00:00:00+00:00"
+
+        second = json.loads(await check_availability.fn(cursor=first["nextCursor"]))
+        assert second["calendars"]["primary"][0]["start"] == "2025-01-09T09:00:00Z"
+
+        third = json.loads(await check_availability.fn(cursor=second["nextCursor"]))
+        assert third == {"calendars": {"primary": []}, "nextCursor": None}
+
+    async def test_rejoins_slot_split_at_chunk_boundary(self, mock_calendar_service):
+        query = mock_calendar_service.freebusy().query
+        query.return_value.execute.side_effect = [
+            _busy(("2025-01-07T22:00:00Z", "2025-01-08T00:00:00Z")),
+            _busy(("2025-01-08T00:00:00Z", "2025-01-08T01:00:00Z")),
+        ]
+        page = json.loads(
+            await check_availability.fn(
+                time_min="2025-01-01T00:00:00Z", time_max="2025-01-10T00:00:00Z", page_size=5
+            )
+        )
+        assert page["calendars"]["primary"] == [
+            {"start": "2025-01-07T22:00:00Z", "end": "2025-01-08T01:00:00Z"}
+        ]
+        assert page["nextCursor"] is None
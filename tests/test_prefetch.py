@@ -0,0 +1,154 @@
+"""Tests for rolling-window prefetch."""
+
+from __future__ import annotations
+
+import json
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+
+import pytest
+
+from gcal_fast_mcp.prefetch import Prefetcher, window_bounds
+from gcal_fast_mcp.tools.event_ops import delete_event, list_events
+
+# A Wednesday
+NOW = datetime(2025, 1, 15, 14, 30, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def clock():
+    return [1000.0]
+
+
+@pytest.fixture
+def service(sample_event_raw):
+    svc = MagicMock()
+    svc.events().list().execute.return_value = {"items": [sample_event_raw]}
+    svc.events().list.reset_mock()
+    return svc
+
+
+@pytest.fixture
+def prefetcher(service, clock):
+    return Prefetcher(
+        lambda: service,
+        calendars=["primary"],
+        min_interval=30.0,
+        max_interval=300.0,
+        clock=lambda: clock[0],
+        now=lambda: NOW,
+    )
+
+
+def _iso(bounds):
+    return bounds[0].isoformat(), bounds[1].isoformat()
+
+
+class TestWindowBounds:
+    def test_today_matches_list_events_default(self):
+        start, end = window_bounds("today", NOW)
+        assert start.isoformat() == "2025-01-15T00:00:00+00:00"
+        assert end.isoformat() == "2025-01-15T23:59:59+00:00"
+
+    def test_weeks_start_on_monday(self):
+        assert window_bounds("this_week", NOW)[0].isoformat() == "2025-01-13T00:00:00+00:00"
+        assert window_bounds("this_week", NOW)[1].isoformat() == "2025-01-19T23:59:59+00:00"
+        assert window_bounds("next_week", NOW)[0].isoformat() == "2025-01-20T00:00:00+00:00"
+
+    def test_unknown_window(self):
+        with pytest.raises(ValueError):
+            window_bounds("fortnight", NOW)
+
+
+class TestPrefetcher:
+    def test_refresh_then_serve_from_memory(self, prefetcher, service):
+        assert prefetcher.refresh_due() == 3
+        items = prefetcher.lookup("primary", *_iso(window_bounds("this_week", NOW)))
+        assert items[0]["id"] == "evt_123"
+
+    def test_matches_equivalent_instants(self, prefetcher):
+        prefetcher.refresh_due()
+        items = prefetcher.lookup("primary", "2025-01-15T00:00:00Z", "2025-01-15T23:59:59Z")
+        assert items is not None
+
+    def test_other_ranges_miss(self, prefetcher):
+        prefetcher.refresh_due()
+        assert prefetcher.lookup("primary", "2025-01-15T00:00:00Z", "2025-01-15T12:00:00Z") is None
+
+    def test_stale_entries_are_not_served(self, prefetcher, clock):
+        prefetcher.refresh_due()
+        clock[0] += 301
+        assert prefetcher.lookup("primary", *_iso(window_bounds("today", NOW))) is None
+
+    def test_hot_windows_refresh_sooner(self, prefetcher):
+        today = _iso(window_bounds("today", NOW))
+        assert prefetcher.interval("primary", "today") == 300.0
+        for _ in range(20):
+            prefetcher.lookup("primary", *today)
+        assert prefetcher.interval("primary", "today") == 30.0
+        assert prefetcher.interval("primary", "next_week") == 300.0
+
+    def test_only_due_windows_are_refetched(self, prefetcher, clock):
+        prefetcher.refresh_due()
+        for _ in range(9):
+            prefetcher.lookup("primary", *_iso(window_bounds("today", NOW)))
+        clock[0] += 31
+        assert prefetcher.refresh_due() == 1
+
+    def test_frequent_calendars_are_added(self, prefetcher):
+        for _ in range(3):
+            prefetcher.lookup("team@example.com", "2025-01-01T00:00:00Z", "2025-02-01T00:00:00Z")
+        assert ("team@example.com", "today") in prefetcher.targets()
+
+    def test_occasional_calendars_are_not_added(self, prefetcher):
+        prefetcher.lookup("team@example.com", "2025-01-01T00:00:00Z", "2025-02-01T00:00:00Z")
+        assert ("team@example.com", "today") not in prefetcher.targets()
+
+    def test_calendars_drop_out_as_scores_decay(self, prefetcher, clock):
+        for _ in range(3):
+            prefetcher.lookup("team@example.com", "2025-01-01T00:00:00Z", "2025-02-01T00:00:00Z")
+        clock[0] += 3600
+        assert ("team@example.com", "today") not in prefetcher.targets()
+
+    def test_invalidate_drops_calendar(self, prefetcher):
+        prefetcher.refresh_due()
+        prefetcher.invalidate("primary")
+        assert prefetcher.lookup("primary", *_iso(window_bounds("today", NOW))) is None
+
+    def test_follows_page_tokens(self, prefetcher, service, sample_event_raw):
+        second = {**sample_event_raw, "id": "evt_456"}
+        service.events().list().execute.side_effect = [
+            {"items": [sample_event_raw], "nextPageToken": "p2"},
+            {"items": [second]},
+        ] + [{"items": []}] * 4
+        prefetcher.refresh_due()
+        items = prefetcher.lookup("primary", *_iso(window_bounds("today", NOW)))
+        assert [e["id"] for e in items] == ["evt_123", "evt_456"]
+
+
+class TestListEventsPrefetch:
+    @pytest.fixture
+    def enabled(self, monkeypatch, prefetcher):
+        from gcal_fast_mcp.config import Config
+
+        config = Config(prefetch=True)
+        monkeypatch.setattr("gcal_fast_mcp.config.get_config", lambda: config)
+        monkeypatch.setattr("gcal_fast_mcp.tools.event_ops.get_config", lambda: config)
+        monkeypatch.setattr("gcal_fast_mcp.prefetch.get_prefetcher", lambda: prefetcher)
+        prefetcher.refresh_due()
+        return prefetcher
+
+    async def test_warm_window_skips_api(self, enabled, mock_calendar_service):
+        start, end = _iso(window_bounds("next_week", NOW))
+        data = json.loads(await list_events.fn(time_min=start, time_max=end))
+        assert data[0]["id"] == "evt_123"
+        assert not mock_calendar_service.events().list.called
+
+    async def test_query_bypasses_prefetch(self, enabled, mock_calendar_service):
+        mock_calendar_service.events().list().execute.return_value = {"items": []}
+        start, end = _iso(window_bounds("next_week", NOW))
+        assert json.loads(await list_events.fn(time_min=start, time_max=end, query="x")) == []
+
+    async def test_mutation_invalidates(self, enabled, mock_calendar_service):
+        await delete_event.fn(event_id="evt_123")
+        assert enabled.lookup("primary", *_iso(window_bounds("today", NOW))) is None
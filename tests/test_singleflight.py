@@ -0,0 +1,121 @@
+"""Tests for in-flight request coalescing."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastmcp import Client
+
+from gcal_fast_mcp.server import mcp
+from gcal_fast_mcp.singleflight import SingleFlight
+
+
+class TestSingleFlight:
+    def test_concurrent_calls_share_result(self):
+        group = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            started.set()
+            release.wait(timeout=5)
+            return {"items": []}
+
+        def caller():
+            return group.do("key", fetch)
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            futures = [pool.submit(caller) for _ in range(4)]
+            started.wait(timeout=5)
+            # Give followers a moment to attach to the in-flight call
+            threading.Event().wait(0.05)
+            release.set()
+            results = [f.result() for f in futures]
+
+        assert len(calls) == 1
+        assert all(r is results[0] for r in results)
+        assert group.in_flight() == 0
+
+    def test_sequential_calls_are_not_cached(self):
+        group = SingleFlight()
+        calls = []
+        group.do("key", lambda: calls.append(1))
+        group.do("key", lambda: calls.append(1))
+        assert len(calls) == 2
+
+    def test_distinct_keys_run_separately(self):
+        group = SingleFlight()
+        assert group.do("a", lambda: 1) == 1
+        assert group.do("b", lambda: 2) == 2
+
+    def test_error_propagates_and_clears_key(self):
+        group = SingleFlight()
+
+        def boom():
+            raise ValueError("upstream failed")
+
+        with pytest.raises(ValueError):
+            group.do("key", boom)
+        assert group.in_flight() == 0
+        assert group.do("key", lambda: "ok") == "ok"
+
+
+class TestListEventsCoalescing:
+    async def test_concurrent_tool_calls_share_upstream_call(
+        self, mock_calendar_service, sample_event_raw
+    ):
+        calls = []
+
+        def execute():
+            calls.append(threading.current_thread())
+            threading.Event().wait(0.3)
+            return {"items": [sample_event_raw]}
+
+        mock_calendar_service.events().list().execute.side_effect = execute
+
+        async with Client(mcp) as client:
+            started = time.perf_counter()
+            results = await asyncio.gather(*(client.call_tool("list_events", {}) for _ in range(4)))
+            elapsed = time.perf_counter() - started
+
+        assert len(calls) == 1
+        assert calls[0] is not threading.main_thread()
+        assert elapsed < 0.9
+        assert all(json.loads(r.content[0].text)[0]["id"] == "evt_123" for r in results)
+
+    async def test_read_after_write_does_not_join_earlier_call(self, mock_calendar_service):
+        calls = []
+        release = threading.Event()
+
+        def execute():
+            calls.append(1)
+            if len(calls) == 1:
+                release.wait(timeout=5)
+            return {"items": []}
+
+        mock_calendar_service.events().list().execute.side_effect = execute
+
+        async def wait_for_calls(n):
+            for _ in range(100):
+                if len(calls) >= n:
+                    return
+                await asyncio.sleep(0.01)
+
+        async with Client(mcp) as client:
+            before = asyncio.create_task(client.call_tool("list_events", {}))
+            await wait_for_calls(1)
+            await client.call_tool("delete_event", {"event_id": "evt_1"})
+
+            after = asyncio.create_task(client.call_tool("list_events", {}))
+            await wait_for_calls(2)
+            release.set()
+            await asyncio.gather(before, after)
+
+        assert len(calls) == 2
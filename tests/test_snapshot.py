@@ -0,0 +1,244 @@
+"""Tests for the offline snapshot archive."""
+
+from __future__ import annotations
+
+import json
+from unittest.mock import MagicMock
+
+import pytest
+
+from gcal_fast_mcp.config import Config
+from gcal_fast_mcp.snapshot import SnapshotArchive, create_snapshot, write_snapshot
+from gcal_fast_mcp.tools.calendar_ops import list_calendars
+from gcal_fast_mcp.tools.event_ops import get_event, list_events
+from gcal_fast_mcp.tools.freebusy_ops import check_availability
+
+
+class _HttpError(Exception):
+    """Stand-in for googleapiclient's HttpError, which exposes ``resp.status``."""
+
+    def __init__(self, status: int):
+        super().__init__(f"HTTP {status}")
+        self.resp = type("Resp", (), {"status": status})()
+
+
+def _timed(event_id, start, end, **extra):
+    return {"id": event_id, "start": {"dateTime": start}, "end": {"dateTime": end}, **extra}
+
+
+@pytest.fixture
+def archive_path(tmp_path, sample_event_raw, sample_allday_event_raw):
+    primary = [
+        _timed("late", "2025-01-16T12:00:00Z", "2025-01-16T13:00:00Z", summary="Lunch"),
+        sample_event_raw,
+        sample_allday_event_raw,
+        # A week-long event that starts well before most query windows
+        _timed("offsite", "2025-01-10T00:00:00Z", "2025-01-17T00:00:00Z", summary="Offsite"),
+        _timed("free", "2025-01-15T15:00:00Z", "2025-01-15T16:00:00Z", transparency="transparent"),
+    ]
+    team = [_timed("team_1", "2025-01-15T14:00:00Z", "2025-01-15T15:00:00Z")]
+    path = tmp_path / "snapshot.bin"
+    write_snapshot(
+        path,
+        [
+            ({"id": "primary", "summary": "Me", "primary": True}, primary),
+            ({"id": "team@example.com", "summary": "Team"}, team),
+        ],
+    )
+    return path
+
+
+@pytest.fixture
+def archive(archive_path):
+    archive = SnapshotArchive(archive_path)
+    yield archive
+    archive.close()
+
+
+class TestArchive:
+    def test_counts(self, archive):
+        assert archive.calendar_count == 2
+        assert archive.event_count == 6
+
+    def test_calendars(self, archive):
+        assert [c["id"] for c in archive.calendars()] == ["primary", "team@example.com"]
+        assert archive.calendar("team@example.com")["summary"] == "Team"
+        with pytest.raises(LookupError):
+            archive.calendar("nope")
+
+    def test_range_is_sorted_and_includes_in_progress_events(self, archive):
+        events = archive.events("primary", "2025-01-15T00:00:00Z", "2025-01-16T00:00:00Z")
+        assert [e["id"] for e in events] == ["offsite", "evt_123", "free"]
+
+    def test_range_excludes_other_calendars(self, archive):
+        events = archive.events("team@example.com", "2025-01-01T00:00:00Z", "2025-02-01T00:00:00Z")
+        assert [e["id"] for e in events] == ["team_1"]
+
+    def test_text_query(self, archive):
+        events = archive.events("primary", "2025-01-01T00:00:00Z", "2025-02-01T00:00:00Z", "lunch")
+        assert [e["id"] for e in events] == ["late"]
+
+    def test_get_event_by_id(self, archive):
+        assert archive.get_event("primary", "evt_123")["summary"] == "Team standup"
+        with pytest.raises(LookupError):
+            archive.get_event("team@example.com", "evt_123")
+
+    def test_busy_skips_transparent_and_merges(self, archive):
+        busy = archive.busy("2025-01-15T00:00:00Z", "2025-01-16T00:00:00Z", ["primary"])
+        assert busy["primary"]["busy"] == [
+            {"start": "2025-01-15T00:00:00Z", "end": "2025-01-16T00:00:00Z"}
+        ]
+
+    def test_busy_of_unarchived_calendar_raises(self, archive):
+        with pytest.raises(LookupError):
+            archive.busy("2025-01-15T00:00:00Z", "2025-01-16T00:00:00Z", ["primary", "x"])
+
+    def test_rejects_other_files(self, tmp_path):
+        path = tmp_path / "junk.bin"
+        path.write_bytes(b"\0" * 64)
+        with pytest.raises(ValueError):
+            SnapshotArchive(path)
+
+
+class TestCreateSnapshot:
+    @pytest.fixture
+    def created(self, tmp_path, monkeypatch, mock_calendar_service, sample_event_raw):
+        mock_calendar_service.calendarList().list().execute.return_value = {
+            "items": [
+                {"id": "me@example.com", "primary": True, "selected": True, "timeZone": "UTC"},
+                {"id": "team@example.com", "selected": True},
+                {"id": "holidays@example.com"},
+            ]
+        }
+        by_calendar = {
+            "me@example.com": [sample_event_raw],
+            "team@example.com": [_timed("team_1", "2025-01-15T14:00:00Z", "2025-01-15T15:00:00Z")],
+        }
+
+        def list_events_request(**kwargs):
+            return MagicMock(
+                execute=lambda: {
+                    "items": by_calendar[kwargs["calendarId"]],
+                    "timeZone": "Europe/Berlin",
+                }
+            )
+
+        mock_calendar_service.events().list.side_effect = list_events_request
+
+        path = tmp_path / "snapshot.bin"
+        assert create_snapshot(path, None, "2025-01-01T00:00:00Z", "2025-02-01T00:00:00Z") == 2
+        config = Config(snapshot="always", snapshot_path=str(path))
+        monkeypatch.setattr("gcal_fast_mcp.config.get_config", lambda: config)
+        monkeypatch.setattr("gcal_fast_mcp.tools.event_ops.get_config", lambda: config)
+        return path
+
+    def test_archives_selected_calendars_under_real_ids(self, created):
+        archive = SnapshotArchive(created)
+        assert [c["id"] for c in archive.calendars()] == ["me@example.com", "team@example.com"]
+        archive.close()
+
+    def test_time_zone_taken_from_events_list_when_missing(self, created):
+        archive = SnapshotArchive(created)
+        assert archive.calendar("me@example.com")["timeZone"] == "UTC"
+        assert archive.calendar("team@example.com")["timeZone"] == "Europe/Berlin"
+        archive.close()
+
+    async def test_primary_alias_resolves(self, created):
+        events = json.loads(
+            await list_events.fn(time_min="2025-01-15T00:00:00Z", time_max="2025-01-16T00:00:00Z")
+        )
+        assert [e["id"] for e in events] == ["evt_123"]
+
+        event = json.loads(await get_event.fn(event_id="evt_123"))
+        assert event["summary"] == "Team standup"
+
+        busy = json.loads(
+            await check_availability.fn(
+                time_min="2025-01-15T00:00:00Z", time_max="2025-01-16T00:00:00Z"
+            )
+        )
+        assert busy == {
+            "primary": [{"start": "2025-01-15T14:00:00Z", "end": "2025-01-15T14:30:00Z"}]
+        }
+
+
+class TestServeFromSnapshot:
+    @pytest.fixture
+    def mode(self, monkeypatch, archive_path):
+        def set_mode(mode):
+            config = Config(snapshot=mode, snapshot_path=str(archive_path))
+            monkeypatch.setattr("gcal_fast_mcp.config.get_config", lambda: config)
+            monkeypatch.setattr("gcal_fast_mcp.tools.event_ops.get_config", lambda: config)
+
+        return set_mode
+
+    async def test_always_skips_api(self, mode, mock_calendar_service):
+        mode("always")
+        data = json.loads(
+            await list_events.fn(time_min="2025-01-16T00:00:00Z", time_max="2025-01-17T00:00:00Z")
+        )
+        assert [e["id"] for e in data] == ["offsite", "late"]
+        assert not mock_calendar_service.events().list.called
+
+    async def test_fallback_when_api_fails(self, mode, mock_calendar_service):
+        mode("fallback")
+        mock_calendar_service.events().get().execute.side_effect = OSError("unreachable")
+        data = json.loads(await get_event.fn(event_id="evt_123"))
+        assert data["summary"] == "Team standup"
+
+    async def test_fallback_on_server_error(self, mode, mock_calendar_service):
+        mode("fallback")
+        mock_calendar_service.events().get().execute.side_effect = _HttpError(503)
+        data = json.loads(await get_event.fn(event_id="evt_123"))
+        assert data["summary"] == "Team standup"
+
+    async def test_fallback_does_not_mask_caller_errors(self, mode, mock_calendar_service):
+        mode("fallback")
+        mock_calendar_service.events().get().execute.side_effect = _HttpError(404)
+        with pytest.raises(_HttpError):
+            await get_event.fn(event_id="evt_123")
+
+        mock_calendar_service.events().list().execute.side_effect = _HttpError(400)
+        with pytest.raises(_HttpError):
+            await list_events.fn(time_min="not a time", time_max="2025-01-17T00:00:00Z")
+
+    async def test_fallback_reraises_api_error_when_snapshot_fails(
+        self, mode, mock_calendar_service
+    ):
+        mode("fallback")
+        mock_calendar_service.events().list().execute.side_effect = _HttpError(503)
+        with pytest.raises(_HttpError):
+            await list_events.fn(time_min="not a time", time_max="2025-01-17T00:00:00Z")
+
+    async def test_fallback_reraises_for_unarchived_calendar(self, mode, mock_calendar_service):
+        mode("fallback")
+        query = mock_calendar_service.freebusy().query
+        query.return_value.execute.side_effect = _HttpError(503)
+        with pytest.raises(_HttpError):
+            await check_availability.fn(
+                time_min="2025-01-15T00:00:00Z",
+                time_max="2025-01-16T00:00:00Z",
+                calendars=["other@example.com"],
+            )
+
+    async def test_fallback_reraises_when_snapshot_lacks_data(self, mode, mock_calendar_service):
+        mode("fallback")
+        mock_calendar_service.events().get().execute.side_effect = OSError("unreachable")
+        with pytest.raises(OSError):
+            await get_event.fn(event_id="missing")
+
+    async def test_off_uses_api(self, mode, mock_calendar_service):
+        mode("off")
+        mock_calendar_service.calendarList().list().execute.return_value = {"items": []}
+        assert json.loads(await list_calendars.fn()) == []
+
+    async def test_availability_from_snapshot(self, mode, mock_calendar_service):
+        mode("always")
+        data = json.loads(
+            await check_availability.fn(
+                time_min="2025-01-16T12:00:00Z",
+                time_max="2025-01-20T00:00:00Z",
+                calendars=["team@example.com"],
+            )
+        )
+        assert data == {"team@example.com": []}
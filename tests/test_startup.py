@@ -0,0 +1,91 @@
+"""Startup benchmark: import time and time-to-first-tool-list with a regression budget.
+
+FastMCP itself is imported first and timed in the same process, and the
+budgets are fractions of that time, so they hold on slow or busy machines.
+This package's own cost on top of FastMCP measures about 6% of it to import
+the server and 2% to list tools. Budgets can be overridden with
+GCAL_IMPORT_BUDGET_RATIO / GCAL_TOOL_LIST_BUDGET_RATIO.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+IMPORT_BUDGET_RATIO = float(os.environ.get("GCAL_IMPORT_BUDGET_RATIO", "0.12"))
+TOOL_LIST_BUDGET_RATIO = float(os.environ.get("GCAL_TOOL_LIST_BUDGET_RATIO", "0.05"))
+
+# Modules that must only be loaded once the Calendar API is actually used
+HEAVY_MODULES = ("google.auth", "google.oauth2", "googleapiclient", "google_auth_oauthlib")
+# Modules of features that are off by default
+OPTIONAL_MODULES = (
+    "gcal_fast_mcp.availability",
+    "gcal_fast_mcp.prefetch",
+    "gcal_fast_mcp.snapshot",
+    "gcal_fast_mcp.write_behind",
+    "sqlite3",
+)
+
+_BENCH = """
+import asyncio, json, sys, time
+
+t0 = time.perf_counter()
+from fastmcp import Client
+t1 = time.perf_counter()
+from gcal_fast_mcp.server import mcp
+t2 = time.perf_counter()
+
+async def first_tool_list():
+    async with Client(mcp) as client:
+        return await client.list_tools()
+
+tools = asyncio.run(first_tool_list())
+t3 = time.perf_counter()
+
+heavy = sorted(m for m in sys.modules if m.startswith(tuple(sys.argv[1:])))
+print(json.dumps({
+    "fastmcp_s": t1 - t0,
+    "import_s": t2 - t1,
+    "tool_list_s": t3 - t2,
+    "tools": sorted(t.name for t in tools),
+    "heavy": heavy,
+}))
+"""
+
+
+@pytest.fixture(scope="module")
+def startup():
+    src = Path(__file__).resolve().parent.parent / "src"
+    pythonpath = os.pathsep.join([str(src), os.environ.get("PYTHONPATH", "")])
+    env = {**os.environ, "PYTHONPATH": pythonpath}
+    proc = subprocess.run(
+        [sys.executable, "-W", "ignore", "-c", _BENCH, *HEAVY_MODULES, *OPTIONAL_MODULES],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+        timeout=60,
+    )
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+class TestStartup:
+    def test_google_stack_not_imported(self, startup):
+        assert [m for m in startup["heavy"] if m.startswith(HEAVY_MODULES)] == []
+
+    def test_disabled_features_not_imported(self, startup):
+        assert [m for m in startup["heavy"] if m.startswith(OPTIONAL_MODULES)] == []
+
+    def test_all_tools_registered(self, startup):
+        assert {"list_events", "check_availability", "list_calendars"} <= set(startup["tools"])
+
+    def test_import_budget(self, startup):
+        assert startup["import_s"] < IMPORT_BUDGET_RATIO * startup["fastmcp_s"]
+
+    def test_tool_list_budget(self, startup):
+        assert startup["tool_list_s"] < TOOL_LIST_BUDGET_RATIO * startup["fastmcp_s"]
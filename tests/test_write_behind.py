@@ -0,0 +1,329 @@
+"""Tests for the write-behind journal and flusher."""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from gcal_fast_mcp.tools.event_ops import create_event, get_operation_status, update_event
+from gcal_fast_mcp.write_behind import WriteBehindQueue
+
+
+class _HttpError(Exception):
+    """Stand-in for googleapiclient's HttpError, which exposes ``resp.status``."""
+
+    def __init__(self, status: int):
+        super().__init__(f"HTTP {status}")
+        self.resp = type("Resp", (), {"status": status})()
+
+
+class _FakeBatch:
+    def __init__(self, service, callback):
+        self._service = service
+        self._callback = callback
+        self._requests = []
+
+    def add(self, request, request_id):
+        self._requests.append((request_id, request))
+
+    def execute(self):
+        if self._service.crash:
+            # The process dies mid-flush, leaving claimed operations running
+            raise SystemExit
+        self._service.batches.append([r for _, r in self._requests])
+        for request_id, (method, kwargs) in self._requests:
+            error = self._service.errors.pop(0) if self._service.errors else None
+            if error is not None:
+                self._callback(request_id, None, error)
+            else:
+                body = kwargs.get("body", {})
+                self._callback(request_id, {"id": body.get("id") or kwargs.get("eventId")}, None)
+
+
+class _FakeEvents:
+    def insert(self, **kwargs):
+        return ("insert", kwargs)
+
+    def quickAdd(self, **kwargs):  # noqa: N802
+        return ("quickAdd", {**kwargs, "eventId": "qa_1"})
+
+    def patch(self, **kwargs):
+        return ("patch", kwargs)
+
+    def delete(self, **kwargs):
+        return ("delete", kwargs)
+
+
+class _FakeService:
+    def __init__(self):
+        self.batches: list[list] = []
+        self.errors: list = []
+        self.crash = False
+
+    def events(self):
+        return _FakeEvents()
+
+    def new_batch_http_request(self, callback):
+        return _FakeBatch(self, callback)
+
+
+@pytest.fixture
+def service():
+    return _FakeService()
+
+
+@pytest.fixture
+def clock():
+    now = [1000.0]
+    return now
+
+
+@pytest.fixture
+def queue(tmp_path, service, clock):
+    q = WriteBehindQueue(tmp_path / "journal.sqlite3", lambda: service, clock=lambda: clock[0])
+    yield q
+    q.stop()
+
+
+class TestCoalescing:
+    def test_updates_merge_into_one(self, queue, service):
+        first = queue.enqueue("update", "primary", "evt_1", {"summary": "A"})
+        second = queue.enqueue("update", "primary", "evt_1", {"location": "Room 1"})
+        assert first.id == second.id
+
+        assert queue.flush() == 1
+        method, kwargs = service.batches[0][0]
+        assert method == "patch"
+        assert kwargs["body"] == {"summary": "A", "location": "Room 1"}
+
+    def test_update_folds_into_queued_create(self, queue, service):
+        created = queue.enqueue("create", "primary", payload={"summary": "Draft"})
+        queue.enqueue("update", "primary", created.event_id, {"summary": "Final"})
+
+        queue.flush()
+        method, kwargs = service.batches[0][0]
+        assert method == "insert"
+        assert kwargs["body"]["summary"] == "Final"
+        assert kwargs["body"]["id"] == created.event_id
+
+    def test_delete_cancels_queued_create(self, queue, service):
+        created = queue.enqueue("create", "primary", payload={"summary": "Oops"})
+        result = queue.enqueue("delete", "primary", created.event_id)
+        assert result.status == "cancelled"
+        assert queue.flush() == 0
+        assert service.batches == []
+
+    def test_update_after_tried_create_is_sent_separately(self, queue, service, clock):
+        created = queue.enqueue("create", "primary", payload={"summary": "Draft"})
+        # The insert reaches the server but its response is lost
+        service.errors.append(_HttpError(503))
+        queue.flush()
+
+        update = queue.enqueue("update", "primary", created.event_id, {"summary": "Final"})
+        assert update.id != created.id
+
+        clock[0] += 5
+        service.errors.append(_HttpError(409))
+        queue.flush()
+        assert queue.get(created.id).status == "done"
+        queue.flush()
+        assert queue.get(update.id).status == "done"
+
+        methods = [m for batch in service.batches for m, _ in batch]
+        assert methods == ["insert", "insert", "patch"]
+        assert service.batches[-1][0][1]["body"] == {"summary": "Final"}
+
+    def test_delete_after_tried_create_is_sent(self, queue, service, clock):
+        created = queue.enqueue("create", "primary", payload={"summary": "Oops"})
+        service.errors.append(_HttpError(503))
+        queue.flush()
+
+        deleted = queue.enqueue("delete", "primary", created.event_id)
+        assert deleted.status == "pending"
+        clock[0] += 5
+        queue.flush()
+        queue.flush()
+        assert [m for batch in service.batches for m, _ in batch] == [
+            "insert",
+            "insert",
+            "delete",
+        ]
+
+    def test_delete_replaces_queued_update(self, queue, service):
+        queue.enqueue("update", "primary", "evt_1", {"summary": "A"})
+        queue.enqueue("delete", "primary", "evt_1")
+        queue.flush()
+        assert [m for m, _ in service.batches[0]] == ["delete"]
+
+
+class TestFlush:
+    def test_batches_distinct_events(self, queue, service):
+        for i in range(3):
+            queue.enqueue("update", "primary", f"evt_{i}", {"summary": str(i)})
+        assert queue.flush() == 3
+        assert len(service.batches) == 1
+        assert queue.list_open() == []
+
+    def test_transient_failure_retries_with_backoff(self, queue, service, clock):
+        op = queue.enqueue("update", "primary", "evt_1", {"summary": "A"})
+        service.errors.append(_HttpError(503))
+
+        queue.flush()
+        pending = queue.get(op.id)
+        assert pending.status == "pending"
+        assert pending.attempts == 1
+
+        # Not due yet
+        assert queue.flush() == 0
+        clock[0] += 5
+        assert queue.flush() == 1
+        assert queue.get(op.id).status == "done"
+
+    def test_permanent_failure_is_not_retried(self, queue, service):
+        op = queue.enqueue("update", "primary", "evt_1", {"summary": "A"})
+        service.errors.append(_HttpError(400))
+        queue.flush()
+        failed = queue.get(op.id)
+        assert failed.status == "failed"
+        assert "400" in failed.error
+
+    def test_retried_create_conflict_counts_as_done(self, queue, service):
+        op = queue.enqueue("create", "primary", payload={"summary": "A"})
+        service.errors.append(_HttpError(409))
+        queue.flush()
+        assert queue.get(op.id).status == "done"
+
+    def test_op_on_queued_quick_add_waits_for_its_id(self, queue, service):
+        added = queue.enqueue("quick_add", "primary", payload={"text": "Lunch"})
+        queue.enqueue("update", "primary", added.id, {"location": "Cafe"})
+
+        queue.flush()
+        assert [m for m, _ in service.batches[0]] == ["quickAdd"]
+        assert queue.get(added.id).result_event_id == "qa_1"
+
+        queue.flush()
+        method, kwargs = service.batches[1][0]
+        assert method == "patch"
+        assert kwargs["eventId"] == "qa_1"
+
+    def test_journal_survives_restart(self, tmp_path, service, clock):
+        path = tmp_path / "journal.sqlite3"
+        first = WriteBehindQueue(path, lambda: service, clock=lambda: clock[0])
+        op = first.enqueue("delete", "primary", "evt_1")
+
+        reopened = WriteBehindQueue(path, lambda: service, clock=lambda: clock[0])
+        assert [o.id for o in reopened.list_open()] == [op.id]
+        reopened.flush()
+        assert reopened.get(op.id).status == "done"
+
+    def _crash_and_reopen(self, tmp_path, service, clock, operation, **kwargs):
+        path = tmp_path / "journal.sqlite3"
+        first = WriteBehindQueue(path, lambda: service, clock=lambda: clock[0])
+        op = first.enqueue(operation, "primary", **kwargs)
+        service.crash = True
+        with pytest.raises(SystemExit):
+            first.flush()
+        service.crash = False
+        return WriteBehindQueue(path, lambda: service, clock=lambda: clock[0]), op
+
+    def test_interrupted_create_counts_as_tried(self, tmp_path, service, clock):
+        queue, created = self._crash_and_reopen(
+            tmp_path, service, clock, "create", payload={"summary": "Draft"}
+        )
+        assert queue.get(created.id).attempts == 1
+
+        update = queue.enqueue("update", "primary", created.event_id, {"summary": "Final"})
+        assert update.id != created.id
+        delete = queue.enqueue("delete", "primary", created.event_id)
+        assert delete.status == "pending"
+        assert queue.get(created.id).status == "pending"
+
+    def test_interrupted_quick_add_is_not_resent(self, tmp_path, service, clock):
+        queue, added = self._crash_and_reopen(
+            tmp_path, service, clock, "quick_add", payload={"text": "Lunch"}
+        )
+        assert queue.get(added.id).status == "failed"
+        assert queue.flush() == 0
+
+
+class TestQuickAddRetries:
+    def test_ambiguous_failure_is_not_retried(self, queue, service):
+        added = queue.enqueue("quick_add", "primary", payload={"text": "Lunch"})
+        service.errors.append(_HttpError(503))
+        queue.flush()
+        failed = queue.get(added.id)
+        assert failed.status == "failed"
+        assert "may have been created" in failed.error
+
+    def test_rate_limit_is_retried(self, queue, service, clock):
+        added = queue.enqueue("quick_add", "primary", payload={"text": "Lunch"})
+        service.errors.append(_HttpError(429))
+        queue.flush()
+        assert queue.get(added.id).status == "pending"
+        clock[0] += 5
+        queue.flush()
+        assert queue.get(added.id).status == "done"
+
+    def test_failure_before_sending_is_retried(self, tmp_path, clock):
+        def unavailable():
+            raise OSError("no network")
+
+        queue = WriteBehindQueue(tmp_path / "journal.sqlite3", unavailable, clock=lambda: clock[0])
+        added = queue.enqueue("quick_add", "primary", payload={"text": "Lunch"})
+        queue.flush()
+        assert queue.get(added.id).status == "pending"
+
+
+class TestCompletionHook:
+    def test_called_once_write_is_applied(self, tmp_path, service, clock):
+        applied = []
+        queue = WriteBehindQueue(
+            tmp_path / "journal.sqlite3",
+            lambda: service,
+            clock=lambda: clock[0],
+            on_applied=applied.append,
+        )
+        queue.enqueue("update", "team@example.com", "evt_1", {"summary": "A"})
+        assert applied == []
+
+        service.errors.append(_HttpError(503))
+        queue.flush()
+        assert applied == []
+
+        clock[0] += 5
+        queue.flush()
+        assert applied == ["team@example.com"]
+
+
+class TestWriteBehindTools:
+    @pytest.fixture
+    def write_behind(self, monkeypatch, queue):
+        from gcal_fast_mcp.config import Config
+
+        monkeypatch.setattr(
+            "gcal_fast_mcp.tools.event_ops.get_config", lambda: Config(write_behind=True)
+        )
+        monkeypatch.setattr("gcal_fast_mcp.write_behind.get_write_queue", lambda: queue)
+        return queue
+
+    async def test_create_returns_pending_operation(self, write_behind, mock_calendar_service):
+        result = json.loads(
+            await create_event.fn(
+                summary="Sync", start="2025-01-15T09:00:00Z", end="2025-01-15T10:00:00Z"
+            )
+        )
+        assert result["status"] == "pending"
+        assert result["operation"] == "create"
+        assert not mock_calendar_service.events().insert.called
+
+    async def test_update_skips_fetch(self, write_behind, mock_calendar_service):
+        result = json.loads(await update_event.fn(event_id="evt_1", summary="New"))
+        assert result["event_id"] == "evt_1"
+        assert not mock_calendar_service.events().get.called
+
+    async def test_operation_status(self, write_behind):
+        op = json.loads(await update_event.fn(event_id="evt_1", summary="New"))
+        status = json.loads(await get_operation_status.fn(operation_id=op["id"]))
+        assert status["status"] == "pending"
+        assert len(json.loads(await get_operation_status.fn())) == 1